@@ -21,6 +21,10 @@ setup(
         "zarr",
         "pygrib"
     ],
+    extras_require={
+        "jit": ["numba"],
+        "mpi": ["mpi4py"]
+    },
     python_requires=">=3.6",  
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -0,0 +1,22 @@
+"""
+Optional Numba support for VCasT.
+
+Numba is not a hard requirement. When it is installed, functions decorated with
+`njit` are compiled to machine code; otherwise `njit` leaves them untouched and
+callers are expected to take their NumPy code path instead (check `HAS_NUMBA`).
+"""
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for `numba.njit` used when Numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+__all__ = ["njit", "prange", "HAS_NUMBA"]
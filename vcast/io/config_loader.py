@@ -1,6 +1,12 @@
 import yaml
 from typing import Any, Dict, List, Union
 
+# The LibYAML-based loader is much faster than the pure-Python one; both are safe
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 class ConfigLoader:
     """Loads and parses a YAML configuration file into structured objects, preserving dictionaries for lists."""
 
@@ -17,7 +23,7 @@ class ConfigLoader:
     def _load_yaml(self, config_file: str):
         """Reads the YAML file and stores its contents."""
         with open(config_file, "r") as file:
-            self.config = yaml.safe_load(file)
+            self.config = yaml.load(file, Loader=SafeLoader)
 
     def _initialize_attributes(self):
         """Assigns YAML keys as attributes and handles nested dictionaries intelligently."""
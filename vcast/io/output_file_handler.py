@@ -78,17 +78,27 @@ class OutputFileHandler:
 
         self.write_to_output_file(header)  # Write header row
 
-    def write_to_output_file(self, row):
+    def write_to_output_file(self, row, flush=True):
         """
         Writes a row to the output file.
 
         Args:
             row (list): List representing a row to write.
+            flush (bool): Flush the file after the row (default). Pass False when
+                writing a batch of rows and call flush() after the last one.
         """
         if self.writer is None:
             raise ValueError("Output file is not open. Ensure open_output_file() was called successfully.")
         self.writer.writerow(row)
-        self.output_file.flush()
+        if flush:
+            self.output_file.flush()
+
+    def flush(self):
+        """
+        Flushes the rows written so far to the output file.
+        """
+        if self.output_file:
+            self.output_file.flush()
 
     def close_output_file(self):
         """
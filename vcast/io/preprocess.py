@@ -4,14 +4,43 @@ import pygrib
 import xarray as xr
 import re
 import os
+import threading
+from functools import lru_cache
 from vcast.stat import AVAILABLE_VARS 
 
+# netCDF4/HDF5 and the file type detection are not thread-safe, so with the thread
+# backend only one thread reads an input file at a time.
+_READ_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1024)
+def _identify_file_type(input_file):
+    """
+    File type detection, cached per path so it is done once per worker.
+    """
+    from vcast.io import FileChecker
+    return FileChecker(input_file).file_type
+
+
+@lru_cache(maxsize=4)
+def _open_dataset(path, stype):
+    """
+    Open a NetCDF file or Zarr store with xarray and keep the handle for reuse.
+
+    Successive dates are often read from the same file (multi-time Zarr stores, or the
+    same reference file for every member), so the last few handles are kept open
+    instead of re-opening and re-decoding the metadata for every date.
+    The returned dataset is shared and must not be closed by the caller.
+    """
+    if stype == 'zarr':
+        return xr.open_zarr(path, decode_timedelta=True)
+    return xr.open_dataset(path, cache=False)
+
 class Preprocessor:
     """Handles input/output file preparation and date formatting."""
 
     @staticmethod
     def read_input_data(input_file, var_name, type_of_level, level, date, lead_time):
-        from vcast.io import FileChecker
         """
         Reads forecast or observation data from a given input file.
 
@@ -20,6 +49,8 @@ class Preprocessor:
             var_name (str): Name of the variable to extract (e.g., "TMP").
             type_of_level (str): Type of level for filtering (e.g., "heightAboveGround").
             level (int): Specific level value to extract (e.g., 2 for 2m temperature).
+            date (datetime): Forecast cycle to select; only used for Zarr stores.
+            lead_time (int): Lead time to select; only used for Zarr stores.
 
         Returns:
             tuple: 
@@ -31,21 +62,21 @@ class Preprocessor:
         Raises:
             Exception: If the file format is unknown or unsupported.
         """
-        stime = date.strftime("%Y-%m-%dT%H:%M:%S")
-        fc = FileChecker(input_file)        
-        file_type = fc.identify_file_type()
-
-        if 'netcdf' in file_type:
-            data, lats, lons = Preprocessor.read_netcdf(input_file, var_name, type_of_level, level)   
-            stype = 'netcdf'
-        elif 'grib2' in file_type:
-            data, lats, lons = Preprocessor.read_grib2(input_file, var_name, type_of_level, level)
-            stype = 'grib2'
-        elif 'zarr' in file_type:
-            data, lats, lons = Preprocessor.read_zarr(input_file, var_name, type_of_level, level, stime, lead_time)
-            stype = 'zarr'            
-        else:
-            raise Exception("Error: File format unknown.")
+        with _READ_LOCK:
+            file_type = _identify_file_type(input_file)
+
+            if 'netcdf' in file_type:
+                data, lats, lons = Preprocessor.read_netcdf(input_file, var_name, type_of_level, level)   
+                stype = 'netcdf'
+            elif 'grib2' in file_type:
+                data, lats, lons = Preprocessor.read_grib2(input_file, var_name, type_of_level, level)
+                stype = 'grib2'
+            elif 'zarr' in file_type:
+                stime = date.strftime("%Y-%m-%dT%H:%M:%S")
+                data, lats, lons = Preprocessor.read_zarr(input_file, var_name, type_of_level, level, stime, lead_time)
+                stype = 'zarr'            
+            else:
+                raise Exception("Error: File format unknown.")
         
         if lats.ndim == 1 and lons.ndim == 1:
             lon_grid, lat_grid = np.meshgrid(lons, lats)
@@ -65,10 +96,13 @@ class Preprocessor:
           - start_date and end_date follow the expected date format ("%Y-%m-%d_%H:%M:%S"),
             and end_date is later than start_date.
           - interpolation is a boolean and, if True, target_grid exists.
+          - interpolation_dtype, if given, is "float64" or "float32" (defaults to "float64").
+          - stat_vars_dtype, if given, is "float64" or "float32" (defaults to "float64").
           - output_dir exists as a directory.
           - stat_type is either "deterministic" or "ensemble".
           - stat_name is a list whose (lowercase) values are in AVAILABLE_VARS.
           - processes is an integer > 0.
+          - backend, if given, is "process", "thread" or "mpi" (defaults to "process").
           - interval_hours is an integer.
           
         Additionally, if any of the optional lead time attributes exist (start_lead_time, end_lead_time, interval_lead_time):
@@ -138,6 +172,18 @@ class Preprocessor:
             if config.interpolation:
                 if not os.path.exists(config.target_grid):
                     raise ValueError(f"target_grid specified does not exist: {config.target_grid}")
+
+            # Optional: precision used for interpolation, "float64" (default) or "float32"
+            if not hasattr(config, 'interpolation_dtype') or config.interpolation_dtype is None:
+                config.interpolation_dtype = "float64"
+            elif config.interpolation_dtype not in {"float64", "float32"}:
+                raise ValueError(f"interpolation_dtype must be either 'float64' or 'float32'. Got: '{config.interpolation_dtype}'")
+
+            # Optional: precision of the stat var columns read by ReadStat, "float64" (default) or "float32"
+            if not hasattr(config, 'stat_vars_dtype') or config.stat_vars_dtype is None:
+                config.stat_vars_dtype = "float64"
+            elif config.stat_vars_dtype not in {"float64", "float32"}:
+                raise ValueError(f"stat_vars_dtype must be either 'float64' or 'float32'. Got: '{config.stat_vars_dtype}'")
             
             # Check that output_dir exists as a directory
             if not os.path.isdir(config.output_dir):
@@ -160,6 +206,12 @@ class Preprocessor:
             # Check processes: must be an integer > 0
             if not isinstance(config.processes, int) or config.processes <= 0:
                 raise ValueError(f"processes must be an integer greater than 0. Got: {config.processes}")
+
+            # Optional: parallel backend, "process" (default), "thread" or "mpi"
+            if not hasattr(config, 'backend') or config.backend is None:
+                config.backend = "process"
+            elif config.backend not in {"process", "thread", "mpi"}:
+                raise ValueError(f"backend must be one of 'process', 'thread' or 'mpi'. Got: '{config.backend}'")
             
             # Check interval_hours: must be an integer
             if not isinstance(config.interval_hours, int):
@@ -428,8 +480,8 @@ class Preprocessor:
         - RuntimeError: If an error occurs while reading the Zarr dataset.
         """
         try:
-            # Open the Zarr dataset using xarray
-            ds = xr.open_zarr(zarr_folder,decode_timedelta=True)
+            # Open the Zarr dataset using xarray (the handle is cached across dates)
+            ds = _open_dataset(zarr_folder, 'zarr')
             
             # If time selection is requested and the dataset has a time coordinate, subset it first.
             if time is not None:
@@ -513,8 +565,8 @@ class Preprocessor:
         - RuntimeError: If an error occurs while reading the NetCDF file.
         """
         try:
-            # Open the NetCDF file using xarray
-            ds = xr.open_dataset(netcdf_file)
+            # Open the NetCDF file using xarray (the handle is cached across dates)
+            ds = _open_dataset(netcdf_file, 'netcdf')
     
             # Ensure the variable exists
             if var_name not in ds:
@@ -556,15 +608,39 @@ class Preprocessor:
             else:
                 # Assume surface field (no level dimension)
                 data = var_data.values
-    
-            # Close the dataset
-            ds.close()
 
             return data, lats, lons
     
         except Exception as e:
             raise RuntimeError(f"Error reading NetCDF file '{netcdf_file}': {e}") from e
 
+    @staticmethod
+    def prefetch_files(paths):
+        """
+        Ask the kernel to start reading the given files into the page cache.
+
+        The reads proceed in the background (posix_fadvise WILLNEED), so the files of a
+        task can be fetched together while the first of them is being decoded. Missing
+        files and directories (Zarr stores) are skipped; this is a no-op on platforms
+        without posix_fadvise.
+
+        Args:
+            paths (iterable): Paths of the files that are about to be read.
+        """
+        if not hasattr(os, "posix_fadvise"):
+            return
+        for path in dict.fromkeys(paths):
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+
     @staticmethod
     def calculate_valid_time(date_obj, lead_time):
         return date_obj + timedelta(hours=lead_time)
@@ -8,6 +8,7 @@ from vcast.stat import ReadStat
 from vcast.plot import LinePlot, Reliability, PerformanceDiagram
 from vcast.processing import process_in_parallel, StatiscalSignificance
 from vcast.io import ConfigLoader, OutputFileHandler, FileChecker
+from vcast.io.config_loader import SafeLoader
 
 
 def detect_yaml_config(file_path):
@@ -25,7 +26,7 @@ def detect_yaml_config(file_path):
 
     try:
         with open(file_path, "r") as file:
-            config = yaml.safe_load(file)
+            config = yaml.load(file, Loader=SafeLoader)
 
         if isinstance(config, dict):
             if all(key in config for key in ["input_stat_folder", "line_type", "date_column", "output_file"]):
@@ -1,4 +1,5 @@
 import matplotlib.pyplot as plt
+import pandas as pd
 import logging
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
@@ -10,6 +11,19 @@ class BasePlot:
         """
         self.config = config_file      
         self.fig, self.ax = None, None  # Initialize figure and axis
+        self._df_cache = {}  # Parsed input files, keyed by path
+
+    def _read(self, path):
+        """
+        Read a tab-separated statistics file, parsing each path only once.
+        Uses the pyarrow CSV engine when it is available.
+        """
+        if path not in self._df_cache:
+            try:
+                self._df_cache[path] = pd.read_csv(path, sep="\t", engine="pyarrow")
+            except ImportError:
+                self._df_cache[path] = pd.read_csv(path, sep="\t")
+        return self._df_cache[path]
 
     def finalize_and_save(self):
         """
@@ -22,7 +22,7 @@ class LinePlot(BasePlot):
             for var, file in var_dict.items():
         
                 # Load data (assuming tab-separated values)
-                data = pd.read_csv(file, sep="\t")
+                data = self._read(file)
                 is_date = False
                 if "date" in data.columns:
                     is_date = True
@@ -59,7 +59,7 @@ class LinePlot(BasePlot):
             var_dict = vars(var_obj)
             for var, file in var_dict.items():
                 # Load data (assuming tab-separated values)
-                data = pd.read_csv(file, sep="\t")
+                data = self._read(file)
                 
                 if hasattr(self.config, 'fcst_var'):
                     if self.config.fcst_var is not None:                
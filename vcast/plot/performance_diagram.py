@@ -1,4 +1,3 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 from .base_plot import BasePlot
 import numpy as np
@@ -19,18 +18,17 @@ class PerformanceDiagram(BasePlot):
         self.ax.set_xlim(0, 1)
         self.ax.set_ylim(0, 1)
 
-        x = np.linspace(0.01, 1, 100)
-        y = np.linspace(0.01, 1, 100)
+        x = np.linspace(0.01, 1, 50)
+        y = np.linspace(0.01, 1, 50)
         X, Y = np.meshgrid(x, y)
         CSI_levels = [0.1, 0.25, 0.5, 0.6, 0.75, 1.0]
         CSI = (X * Y) / (X + Y - X * Y)
     
         # Shade CSI regions with different gray levels
         shades = [0.9, 0.8, 0.7, 0.6, 0.5, 0.4]  # Shades for CSI levels
-        for i, level in enumerate(CSI_levels[:-1]):
-            self.ax.contourf(
-                X, Y, CSI, levels=[level, CSI_levels[i + 1]], colors=[str(shades[i])], alpha=0.8
-            )
+        self.ax.contourf(
+            X, Y, CSI, levels=CSI_levels, colors=[str(shade) for shade in shades[:len(CSI_levels) - 1]], alpha=0.8
+        )
     
         # Plot CSI contour lines
         contour = self.ax.contour(X, Y, CSI, levels=CSI_levels, colors="black", linestyles="solid")
@@ -38,16 +36,20 @@ class PerformanceDiagram(BasePlot):
         self.ax.text(1.05, 0.5, "CSI Curves", rotation=270, fontsize=12, va="center", color="black")
     
         # Add frequency bias (FBIAS) lines
-        FB_values = [0.1, 0.25, 0.5, 1, 2, 4, 10]
-        for FB in FB_values:
-            fb_y = np.minimum(1, FB * x)
-            self.ax.plot(x, fb_y, linestyle="--", color="black", linewidth=0.8)
-    
-            # Add value labels for FBIAS lines at the end
-            end_x = x[np.where(fb_y < 1)[0][-1]]  # The last valid x-coordinate
-            end_y = fb_y[np.where(fb_y < 1)[0][-1]]  # The corresponding y-coordinate
+        # Each line y = FB * x is straight until it leaves the unit square, so only its
+        # end points are needed: (0, 0) and (min(1, 1/FB), min(1, FB)).
+        FB_values = np.array([0.1, 0.25, 0.5, 1, 2, 4, 10])
+        end_x = np.minimum(1.0, 1.0 / FB_values)
+        end_y = np.minimum(1.0, FB_values)
+        self.ax.plot(
+            np.vstack([np.zeros_like(end_x), end_x]), np.vstack([np.zeros_like(end_y), end_y]),
+            linestyle="--", color="black", linewidth=0.8
+        )
+
+        # Add value labels for FBIAS lines at the end (where the line reaches the top or right edge)
+        for FB, fb_x, fb_y in zip(FB_values, end_x, end_y):
             self.ax.text(
-                end_x + 0.02, end_y, f"{FB:.1f}", fontsize=10, color="black", ha="left", va="center"
+                fb_x + 0.02, fb_y, f"{FB:.1f}", fontsize=10, color="black", ha="left", va="center"
             )
 
         self.ax.grid(True, linestyle="--", alpha=0.5)
@@ -61,7 +63,7 @@ class PerformanceDiagram(BasePlot):
         """
         for i, file in enumerate(self.config.vars):
             # Load data (assuming tab-separated values)
-            data = pd.read_csv(file, sep="\t")
+            data = self._read(file)
             
             if self.config.fcst_var is not None:
                 data = data[data["fcst_var"] == self.config.fcst_var]
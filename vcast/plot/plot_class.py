@@ -2,8 +2,13 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection
 from vcast.io import ConfigLoader
 
+# Columns used by the performance and Taylor diagrams; only these are parsed
+PERFORMANCE_COLUMNS = ('POD', 'SR', 'CSI', 'FBIAS')
+TAYLOR_COLUMNS = ('STDEV', 'CORR')
+
 class Plot:
     def __init__(self, config_file):
         """
@@ -30,6 +35,8 @@ class Plot:
         self.grid = config.grid
         self.yticks = config.yticks
         self.xticks = config.xticks
+        self._df_cache = {}  # Parsed input files, keyed by path
+        self._group_cache = {}  # Rows per `unique` value, per input file
 
         # Ensure the vars dictionary is formatted correctly
         # if not isinstance(self.vars_dict, list) or not all(isinstance(item, dict) for item in self.vars_dict):
@@ -48,12 +55,39 @@ class Plot:
 
             raise ValueError("Mismatch in number of input files and line properties in YAML configuration.")
 
+    def _read(self, path, columns=None):
+        """
+        Read a tab-separated statistics file, parsing each path only once.
+        Uses the pyarrow CSV engine when it is available.
+
+        If `columns` is given, only those columns are parsed, as float32.
+        Otherwise the x-axis values are added once as the '__x' column (matplotlib
+        date numbers from 'date', or the integer 'fcst_lead') and
+        `attrs['is_date']` records which one was used.
+        """
+        key = (path, tuple(columns) if columns else None)
+        if key not in self._df_cache:
+            kwargs = {"usecols": list(columns), "dtype": dict.fromkeys(columns, "float32")} if columns else {}
+            try:
+                df = pd.read_csv(path, sep="\t", engine="pyarrow", **kwargs)
+            except ImportError:
+                df = pd.read_csv(path, sep="\t", **kwargs)
+            if not columns:
+                if "date" in df.columns:
+                    df["__x"] = mdates.date2num(pd.to_datetime(df["date"], format="ISO8601", cache=True))
+                    df.attrs["is_date"] = True
+                elif "fcst_lead" in df.columns:
+                    df["__x"] = pd.to_numeric(df["fcst_lead"], errors="coerce").astype("Int64")
+                    df.attrs["is_date"] = False
+            self._df_cache[key] = df
+        return self._df_cache[key]
+
     def setup_performance_diagram(self):
         """
         Set up the base grid for the Performance Diagram.
         """
-        x = np.linspace(0.01, 1, 100)
-        y = np.linspace(0.01, 1, 100)
+        x = np.linspace(0.01, 1, 50)
+        y = np.linspace(0.01, 1, 50)
         X, Y = np.meshgrid(x, y)
         CSI_levels = [0.1, 0.25, 0.5, 0.6, 0.75, 1.0]
         CSI = (X * Y) / (X + Y - X * Y)
@@ -62,10 +96,9 @@ class Plot:
     
         # Shade CSI regions with different gray levels
         shades = [0.9, 0.8, 0.7, 0.6, 0.5, 0.4]  # Shades for CSI levels
-        for i, level in enumerate(CSI_levels[:-1]):
-            self.ax.contourf(
-                X, Y, CSI, levels=[level, CSI_levels[i + 1]], colors=[str(shades[i])], alpha=0.8
-            )
+        self.ax.contourf(
+            X, Y, CSI, levels=CSI_levels, colors=[str(shade) for shade in shades[:len(CSI_levels) - 1]], alpha=0.8
+        )
     
         # Plot CSI contour lines
         contour = self.ax.contour(X, Y, CSI, levels=CSI_levels, colors="black", linestyles="solid")
@@ -73,16 +106,20 @@ class Plot:
         self.ax.text(1.05, 0.5, "CSI Curves", rotation=270, fontsize=12, va="center", color="black")
     
         # Add frequency bias (FBIAS) lines
-        FB_values = [0.1, 0.25, 0.5, 1, 2, 4, 10]
-        for FB in FB_values:
-            fb_y = np.minimum(1, FB * x)
-            self.ax.plot(x, fb_y, linestyle="--", color="black", linewidth=0.8)
-    
-            # Add value labels for FBIAS lines at the end
-            end_x = x[np.where(fb_y < 1)[0][-1]]  # The last valid x-coordinate
-            end_y = fb_y[np.where(fb_y < 1)[0][-1]]  # The corresponding y-coordinate
+        # Each line y = FB * x is straight until it leaves the unit square, so only its
+        # end points are needed: (0, 0) and (min(1, 1/FB), min(1, FB)).
+        FB_values = np.array([0.1, 0.25, 0.5, 1, 2, 4, 10])
+        end_x = np.minimum(1.0, 1.0 / FB_values)
+        end_y = np.minimum(1.0, FB_values)
+        self.ax.plot(
+            np.vstack([np.zeros_like(end_x), end_x]), np.vstack([np.zeros_like(end_y), end_y]),
+            linestyle="--", color="black", linewidth=0.8
+        )
+
+        # Add value labels for FBIAS lines at the end (where the line reaches the top or right edge)
+        for FB, fb_x, fb_y in zip(FB_values, end_x, end_y):
             self.ax.text(
-                end_x + 0.02, end_y, f"{FB:.1f}", fontsize=10, color="black", ha="left", va="center"
+                fb_x + 0.02, fb_y, f"{FB:.1f}", fontsize=10, color="black", ha="left", va="center"
             )
     
         # Add plot title and labels
@@ -101,8 +138,8 @@ class Plot:
         for file, label, color, marker, line_style, line_width in zip(
             self.vars, self.labels, self.colors, self.markers, self.line_styles, self.line_widths
         ):
-            df = pd.read_csv(file,sep="\t")
-            df = df.dropna(subset=['POD', 'SR', 'CSI', 'FBIAS'])
+            df = self._read(file, PERFORMANCE_COLUMNS)
+            df = df.dropna()
             self.ax.plot(
                 df['SR'], df['POD'], label=label, color=color, marker=marker,
                 linestyle=line_style, linewidth=line_width, alpha=0.8
@@ -127,46 +164,36 @@ class Plot:
         self.ax.set_xticklabels([f"{corr:.1f}" for corr in corr_ticks], fontsize=10)
 
         # Add dotted blue lines for correlation grid
-        for angle in corr_angles:
-            self.ax.plot([angle, angle], [0, self.std_max + 0.5], linestyle='--', color='lightblue', alpha=0.7, linewidth=0.6)
+        grid_segments = np.stack([
+            np.column_stack([corr_angles, np.zeros_like(corr_angles)]),
+            np.column_stack([corr_angles, np.full_like(corr_angles, self.std_max + 0.5)])
+        ], axis=1)
+        self.ax.add_collection(LineCollection(
+            grid_segments, linestyles='--', colors='lightblue', alpha=0.7, linewidths=0.6
+        ))
 
         # Standard deviation arcs
         stddev_arcs = np.arange(0.5, self.std_max + 0.6, 0.5)
-        for std in stddev_arcs:
-            t = np.linspace(0, np.pi / 2, 100)
-            r = np.full_like(t, std)
-            self.ax.plot(t, r, linestyle='--', color='lightblue', alpha=0.7, linewidth=0.6)
-
-        # Add markers for every 0.05 correlation at the plot limit
-        corr_markers = np.linspace(0.0, 0.99, 100)  # Correlation from 0 to 1 with 0.05 step
-        corr_marker_angles = np.arccos(corr_markers)
-        plot_limit = self.std_max # Get the maximum radius of the plot
-        for angle in corr_marker_angles:
-            self.ax.plot(
-                [angle, angle], 
-                [plot_limit - 0.05, plot_limit],  # Place markers exactly at the plot limit
-                color='black', alpha=1, linewidth=1.2
-            )
+        t = np.linspace(0, np.pi / 2, 100)
+        arc_segments = np.stack(np.broadcast_arrays(t[None, :], stddev_arcs[:, None]), axis=-1)
+        self.ax.add_collection(LineCollection(
+            arc_segments, linestyles='--', colors='lightblue', alpha=0.7, linewidths=0.6
+        ))
 
-        corr_markers = np.linspace(0.0, 0.95, 20)  # Correlation from 0 to 1 with 0.05 step
-        corr_marker_angles = np.arccos(corr_markers)
-        plot_limit = self.std_max # Get the maximum radius of the plot
-        for angle in corr_marker_angles:
-            self.ax.plot(
-                [angle, angle], 
-                [plot_limit - 0.1, plot_limit],  # Place markers exactly at the plot limit
-                color='black', alpha=1, linewidth=1.2
-            )
-
-        corr_markers = np.linspace(0.0, 0.9, 10)  # Correlation from 0 to 1 with 0.05 step
-        corr_marker_angles = np.arccos(corr_markers)
+        # Add markers at the plot limit: short ticks every 0.01, longer every 0.05 and 0.1 correlation
         plot_limit = self.std_max  # Get the maximum radius of the plot
-        for angle in corr_marker_angles:
-            self.ax.plot(
-                [angle, angle], 
-                [plot_limit - 0.15, plot_limit],  # Place markers exactly at the plot limit
-                color='black', alpha=1, linewidth=1.2
-            )
+        tick_groups = [
+            (np.linspace(0.0, 0.99, 100), 0.05),
+            (np.linspace(0.0, 0.95, 20), 0.1),
+            (np.linspace(0.0, 0.9, 10), 0.15),
+        ]
+        corr_marker_angles = np.concatenate([np.arccos(markers) for markers, _ in tick_groups])
+        tick_starts = np.concatenate([np.full(len(markers), plot_limit - length) for markers, length in tick_groups])
+        tick_segments = np.stack([
+            np.column_stack([corr_marker_angles, tick_starts]),
+            np.column_stack([corr_marker_angles, np.full_like(tick_starts, plot_limit)])
+        ], axis=1)
+        self.ax.add_collection(LineCollection(tick_segments, colors='black', alpha=1, linewidths=1.2))
 
         # Add labels for standard deviation and correlation
         self.ax.text(np.pi / 4, self.std_max * 1.1, "Correlation", fontsize=12, ha="center", va="center", rotation=-45)
@@ -182,18 +209,10 @@ class Plot:
         self.ax.grid(False)  # Disable the grid lines
 
     def get_std_max(self):
-
-        std_max = 0
-        for file in self.vars:
-            df = pd.read_csv(file)
-
-            # Extract standard deviation and correlation from the file
-            stddev = df['STDEV'].values
-
-            if np.max(stddev) > std_max:
-                std_max = np.max(stddev)
-
-        self.std_max = std_max
+        """
+        Largest standard deviation across all input files (sets self.std_max).
+        """
+        self.std_max = max((self._read(file, TAYLOR_COLUMNS)['STDEV'].max() for file in self.vars), default=0)
 
 
     def add_to_taylor_diagram(self):
@@ -201,7 +220,7 @@ class Plot:
         Add data from input files to the Taylor Diagram.
         """
         for file, label, color, marker in zip(self.vars, self.labels, self.colors, self.markers):
-            df = pd.read_csv(file,sep="\t")
+            df = self._read(file, TAYLOR_COLUMNS)
 
             # Extract standard deviation and correlation from the file
             stddev = df['STDEV'].values
@@ -213,18 +232,19 @@ class Plot:
             # Plot the points on the Taylor Diagram
             self.ax.scatter(angles, stddev, label=label, color=color, marker=marker, s=20)
 
-            self.ax.set_rmax(self.std_max)
+        self.ax.set_rmax(self.std_max)
 
-            # Get the ticks automatically set on the horizontal axis
-            stddev_ticks = self.ax.get_yticks()[:-1]
-            
-            # Vertical axis (top side)
-            for std in stddev_ticks:
-                if std > 0:  # Avoid placing a tick at zero if unnecessary
-                    self.ax.text(
-                        np.pi / 2, std, f"{std}", ha="center", va="center",
-                        transform=self.ax.transData + plt.matplotlib.transforms.ScaledTranslation(-0.15, 0, self.fig.dpi_scale_trans)
-                    )
+        # Get the ticks automatically set on the horizontal axis; they only depend on
+        # std_max, so the labels are added once rather than once per file.
+        stddev_ticks = self.ax.get_yticks()[:-1]
+
+        # Vertical axis (top side)
+        for std in stddev_ticks:
+            if std > 0:  # Avoid placing a tick at zero if unnecessary
+                self.ax.text(
+                    np.pi / 2, std, f"{std}", ha="center", va="center",
+                    transform=self.ax.transData + plt.matplotlib.transforms.ScaledTranslation(-0.15, 0, self.fig.dpi_scale_trans)
+                )
 
     def setup_line_plot(self):
         """
@@ -244,16 +264,13 @@ class Plot:
                 var_dict_as_dict = vars(var_dict)  # Convert ConfigObject to a dictionary
                 for var, file in var_dict_as_dict.items():
             
-                    # Load data (assuming tab-separated values)
-                    data = pd.read_csv(file, sep="\t")
-
-                    is_date = False
-                    if "date" in data.columns:
-                        is_date = True
+                    # Load data (cached, so add_lines_to_plot reuses the same frame)
+                    data = self._read(file)
+                    self.is_date = data.attrs.get("is_date", False)
 
                     break
 
-            if is_date:
+            if self.is_date:
                 # Set the x-axis to use date formatting (assumes x-axis values are datetime)
                 self.ax.xaxis.set_major_locator(mdates.AutoDateLocator())
                 self.ax.xaxis.set_major_formatter(mdates.DateFormatter("%m-%d %H:%M"))
@@ -273,6 +290,14 @@ class Plot:
         except Exception as e:
             raise RuntimeError(f"Error in `setup_line_plot`: {str(e)}")
 
+    def _groups(self, file, data):
+        """
+        Rows of a file split by the `unique` column in one pass, keyed by value in sorted order.
+        """
+        if file not in self._group_cache:
+            self._group_cache[file] = dict(tuple(data.groupby(self.unique, sort=True)))
+        return self._group_cache[file]
+
     def add_lines_to_plot(self):
         """
         Adds lines to the provided Matplotlib axis object based on YAML configuration.
@@ -285,25 +310,26 @@ class Plot:
                 for var, file in var_dict_as_dict.items():
             
                     # Load data (assuming tab-separated values)
-                    data = pd.read_csv(file, sep="\t")
+                    data = self._read(file)
         
+                    if "__x" not in data.columns:
+                        raise ValueError(f"Neither 'date' nor 'fcst_lead' columns found in the file {file}.")
+
                     # Handle the unique grouping (if applicable)
                     if self.unique is not None:
                         if self.unique in data.columns:
-                            values = np.unique(data[self.unique])                            
+                            groups = self._groups(file, data)
+                            values = list(groups)  # Sorted unique values
                             if i < len(values):  # Ensure index is within bounds
-                                data = data[data[self.unique] == values[i-1]]
+                                data = groups[values[i]]
                             else:
                                 raise IndexError(f"Index {i} out of bounds for unique values in {self.unique}.")
-        
+
                     # Determine x-axis values based on 'date' or 'fcst_lead'
-                    if "date" in data.columns:
-                        dates = pd.to_datetime(data["date"])
-                        x_values = mdates.date2num(dates)
-                    elif "fcst_lead" in data.columns:
-                        x_values = pd.to_numeric(data["fcst_lead"], errors="coerce").astype("Int64")
+                    if data.attrs["is_date"]:
+                        x_values = data["__x"].to_numpy()
                     else:
-                        raise ValueError(f"Neither 'date' nor 'fcst_lead' columns found in the file {file}.")
+                        x_values = data["__x"]
         
                     # Ensure the variable exists in the DataFrame
                     if var not in data.columns:
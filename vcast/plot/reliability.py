@@ -1,4 +1,3 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from .base_plot import BasePlot
@@ -22,7 +21,7 @@ class Reliability(BasePlot):
             for var, file in var_dict.items():
         
                 # Load data (assuming tab-separated values)
-                data = pd.read_csv(file, sep="\t")
+                data = self._read(file)
                 is_date = False
                 if "date" in data.columns:
                     is_date = True
@@ -51,7 +50,7 @@ class Reliability(BasePlot):
             var_dict = vars(var_obj)
             for var, file in var_dict.items():
                 # Load data (assuming tab-separated values)
-                data = pd.read_csv(file, sep="\t")
+                data = self._read(file)
                 
                 data = data[(data["fcst_lead"] == var)]
 
@@ -11,9 +11,9 @@ Modules:
 - postprocessing.py: Implements the class StatisticalSignificance.
 """
 
-from .interpolation import interpolate_to_target_grid
+from .interpolation import interpolate_to_target_grid, build_regridder
 from .parallel_processing import process_in_parallel
 from .postprocessing import StatiscalSignificance
 
-__all__ = ["process_in_parallel", "interpolate_to_target_grid",
+__all__ = ["process_in_parallel", "interpolate_to_target_grid", "build_regridder",
            "StatiscalSignificance"]
@@ -1,46 +1,139 @@
 from vcast.io import FileChecker
+from vcast._jit import njit, prange, HAS_NUMBA
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from multiprocessing import shared_memory
 import numpy as np
 import xarray as xr
-from scipy.interpolate import griddata
+from scipy.spatial import Delaunay, cKDTree
+from scipy.sparse import csr_matrix
 import pygrib
 
+# Interpolation plans (Delaunay vertices and barycentric weights) keyed by
+# source grid and target file, so each worker triangulates a grid only once;
+# the least recently used plan is evicted beyond _PLAN_CACHE_SIZE entries.
+_PLAN_CACHE = OrderedDict()
+_PLAN_CACHE_SIZE = 4
+_PLAN_LOCK = threading.Lock()
 
-def interpolate_to_target_grid(src_data, src_lats, src_lons, target_file):
+# Target grids attached from shared memory, keyed by target file (see _share_target_grid)
+_SHARED_TARGET_GRIDS = {}
+
+# Whether _apply_weights always runs the single-threaded kernel (see _use_serial_kernel)
+_SERIAL_KERNEL = False
+
+
+@njit(parallel=True, fastmath={"reassoc", "contract"}, cache=True, nogil=True)
+def _bilinear_apply(values, vertices, weights, out):
     """
-    Interpolate data from a source grid (lat/lon) to a target grid extracted from a 
-    NetCDF file or Zarr dataset, but only perform interpolation if the target grid is 
-    different from the source grid.
+    Apply precomputed barycentric weights to the source values.
 
     Parameters:
-    - src_data (numpy.ndarray): Source data array (2D).
-    - src_lats (numpy.ndarray): Source latitude array (2D).
-    - src_lons (numpy.ndarray): Source longitude array (2D).
-    - target_file (str): Path to the file containing the target grid. If the path is a directory,
-      it is assumed to be a Zarr dataset; otherwise, it is assumed to be a NetCDF file.
-      The dataset is expected to have variables 'latitude' (or 'lat') and 'longitude' (or 'lon').
+    - values (numpy.ndarray): Flattened source values (same dtype as weights).
+    - vertices (numpy.ndarray): (n_target, 3) indices of the enclosing triangle vertices.
+    - weights (numpy.ndarray): (n_target, 3) barycentric weights (NaN outside the hull).
+    - out (numpy.ndarray): Output array of length n_target, filled in place.
+    """
+    for i in prange(vertices.shape[0]):
+        out[i] = (values[vertices[i, 0]] * weights[i, 0]
+                  + values[vertices[i, 1]] * weights[i, 1]
+                  + values[vertices[i, 2]] * weights[i, 2])
 
-    Returns:
-    - numpy.ndarray: Interpolated data on the target grid, or the original src_data if the 
-      target grid matches the source grid.
+
+# Single-threaded build of the same kernel for pool workers (threads, processes or MPI
+# ranks): the parallelism already comes from the pool, and Numba's default threading
+# layer may not be re-entrant.
+_bilinear_apply_serial = njit(fastmath={"reassoc", "contract"}, cache=True, nogil=True)(
+    getattr(_bilinear_apply, "py_func", _bilinear_apply))
+
+
+def _weight_matrix(vertices, weights, n_src):
+    """
+    The interpolation plan as a sparse (n_target, n_src) matrix with the three
+    barycentric weights of each target point on its row, in vertex order.
+    """
+    n_target = vertices.shape[0]
+    indptr = np.arange(0, 3 * n_target + 1, 3)
+    return csr_matrix((weights.ravel(), vertices.ravel(), indptr), shape=(n_target, n_src))
+
+
+def _use_serial_kernel(serial=True):
+    """
+    Make _apply_weights use the single-threaded kernel in this process. Called
+    by the initializer of pool worker processes (and MPI ranks): each worker
+    runs its tasks on its own main thread, and a Numba thread pool per worker
+    would oversubscribe the cores the pool already uses.
+    """
+    global _SERIAL_KERNEL
+    _SERIAL_KERNEL = serial
+
+
+def _apply_weights(values, vertices, weights, matrix=None):
+    """
+    Interpolate flattened source values with a precomputed plan.
+    The computation is done in the dtype of the weights (float64 or float32).
+    Uses the compiled kernel when Numba is available and otherwise a sparse
+    matrix-vector product with `matrix` (built from the plan when not given).
+
+    The multithreaded kernel only runs on the main thread of a process that
+    is not a pool worker: a single worker process, or a direct caller. Worker
+    threads of the "thread" backend, and worker processes or MPI ranks of a
+    pool with more than one worker (see _use_serial_kernel), run the serial one.
+    """
+    values = np.ascontiguousarray(values, dtype=weights.dtype)
+    if HAS_NUMBA:
+        out = np.empty(vertices.shape[0], dtype=weights.dtype)
+        if not _SERIAL_KERNEL and threading.current_thread() is threading.main_thread():
+            _bilinear_apply(values, vertices, weights, out)
+        else:
+            _bilinear_apply_serial(values, vertices, weights, out)
+        return out
+    if matrix is None:
+        matrix = _weight_matrix(vertices, weights, values.size)
+    return matrix @ values
+
+
+def _warm_up(dtype=np.float64):
+    """
+    Run the interpolation kernel once on a tiny grid so the JIT compilation
+    (or the load from Numba's on-disk cache) is not paid by the first task.
+
+    This is called from worker initializers rather than at import time: starting
+    Numba's thread pool in a parent process that later forks leaves the pool's
+    workers unable to shut down cleanly.
+    """
+    _apply_weights(np.zeros(3), np.zeros((1, 3), dtype=np.intp), np.zeros((1, 3), dtype=dtype))
+
+
+@lru_cache(maxsize=8)
+def _load_target_grid(target_file):
     """
+    Read the target latitude/longitude grid from a NetCDF, Zarr or GRIB2 file.
+
+    Longitudes are converted to [0, 360]. The result is cached per file and
+    returned as a read-only array.
 
-    fc = FileChecker(target_file)    
+    Returns:
+    - numpy.ndarray: (ny, nx, 2) array of target (lat, lon) pairs.
+    """
+    fc = FileChecker(target_file)
     file_type = fc.identify_file_type()
- 
+
     if 'netcdf' in file_type:
         stype = 'netcdf'
     elif 'grib2' in file_type:
         stype = 'grib2'
     elif 'zarr' in file_type:
-        stype = 'zarr'            
+        stype = 'zarr'
     else:
-        raise Exception("Error: File format unknown.")    
+        raise Exception("Error: File format unknown.")
 
     # Open target dataset using xarray for both NetCDF and Zarr
     if stype == 'zarr':
         ds = xr.open_zarr(target_file,decode_timedelta=True)
     elif stype == 'netcdf':
-        ds = xr.open_dataset(target_file,decode_timedelta=True)    
+        ds = xr.open_dataset(target_file,decode_timedelta=True)
     elif stype == 'grib2':
         ds = pygrib.open(target_file)
 
@@ -53,7 +146,7 @@ def interpolate_to_target_grid(src_data, src_lats, src_lons, target_file):
         else:
             ds.close()
             raise ValueError("Latitude variable not found in target dataset.")
-    
+
         # Extract target longitude array
         if 'longitude' in ds:
             target_lons = ds['longitude'].values
@@ -66,54 +159,245 @@ def interpolate_to_target_grid(src_data, src_lats, src_lons, target_file):
         msg = ds.message(1)
         _, target_lats, target_lons = msg.data()
 
-    if np.min(target_lons) < 0:
-        target_lons[target_lons < 0] += 360  # Convert from [-180, 180] to [0, 360]
-
-    if np.min(src_lons) < 0:
-        src_lons[src_lons < 0] += 360  # Convert from [-180, 180] to [0, 360]
-
     # Close the dataset to free resources
     ds.close()
 
-    # If target_lats and target_lons are 1D, create a meshgrid.
+    target_lons = np.array(target_lons)
+    if np.min(target_lons) < 0:
+        target_lons[target_lons < 0] += 360  # Convert from [-180, 180] to [0, 360]
+
+    # Fill the (lat, lon) pairs directly; 1D coordinates are broadcast without a meshgrid.
     if target_lats.ndim == 1 and target_lons.ndim == 1:
-        target_lon_grid, target_lat_grid = np.meshgrid(target_lons, target_lats)
+        target_points = np.empty((target_lats.size, target_lons.size, 2))
+        target_points[..., 0] = target_lats[:, None]
+        target_points[..., 1] = target_lons[None, :]
     else:
-        target_lat_grid, target_lon_grid = target_lats, target_lons
+        target_points = np.empty(target_lats.shape + (2,))
+        target_points[..., 0] = target_lats
+        target_points[..., 1] = target_lons
+
+    target_points.flags.writeable = False
+    return target_points
+
+
+def _share_target_grid(target_file):
+    """
+    Copy the target grid into shared memory so worker processes can attach to it
+    instead of each reading the file and holding its own copy.
+
+    Returns:
+    - tuple: (shm, shape) where shm is the SharedMemory block (the caller closes and
+      unlinks it once the workers are done) and shape the shape of the grid array.
+    """
+    target_points = _load_target_grid(target_file)
+    shm = shared_memory.SharedMemory(create=True, size=target_points.nbytes)
+    np.ndarray(target_points.shape, dtype=target_points.dtype, buffer=shm.buf)[...] = target_points
+    return shm, target_points.shape
+
+
+def _attach_target_grid(target_file, shm_name, shape):
+    """
+    Use a target grid published by _share_target_grid for target_file in this process.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    target_points = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    target_points.flags.writeable = False
+    _SHARED_TARGET_GRIDS[target_file] = (shm, target_points)
+
+
+def _target_grid(target_file):
+    """
+    Target grid as a (ny, nx, 2) array, from shared memory if it was published, else from the file.
+    """
+    if target_file in _SHARED_TARGET_GRIDS:
+        return _SHARED_TARGET_GRIDS[target_file][1]
+    return _load_target_grid(target_file)
+
+
+def _build_plan(src_lats, src_lons, target_points):
+    """
+    Triangulate the source grid and locate every target point in it.
 
-    # Check if the target grid is identical to the source grid.
-    if (src_lats.shape == target_lat_grid.shape and src_lons.shape == target_lon_grid.shape):
-        if np.allclose(src_lats, target_lat_grid) and np.allclose(src_lons, target_lon_grid):
-            # No interpolation needed; return the original data.
-            return src_data
+    The vertices and barycentric weights reproduce scipy's `griddata(method='linear')`;
+    target points outside the convex hull get NaN weights.
 
-    # Flatten the source data and its coordinate arrays.
+    Parameters:
+    - target_points (numpy.ndarray): (n, 2) array of target (lat, lon) pairs.
+
+    Returns:
+    - tuple: (src_points, vertices, weights).
+    """
     src_points = np.column_stack((src_lats.ravel(), src_lons.ravel()))
-    src_values = src_data.ravel()
-
-    # Flatten the target grid.
-    target_points = np.column_stack((target_lat_grid.ravel(), target_lon_grid.ravel()))
-
-    # Perform interpolation using the linear method.
-    interpolated_flat = griddata(
-        points=src_points,
-        values=src_values,
-        xi=target_points,
-        method='linear'
-    )
-
-    # For any points where linear interpolation returns NaN, use nearest-neighbor interpolation.
-    mask_nan = np.isnan(interpolated_flat)
-    if np.any(mask_nan):
-        nearest_flat = griddata(
-            points=src_points,
-            values=src_values,
-            xi=target_points,
-            method='nearest'
-        )
-        interpolated_flat[mask_nan] = nearest_flat[mask_nan]
-
-    # Reshape the interpolated data to match the target grid shape.
-    interpolated_data = interpolated_flat.reshape(target_lat_grid.shape)
-
-    return interpolated_data
+
+    tri = Delaunay(src_points)
+    simplex = tri.find_simplex(target_points)
+    inside = simplex >= 0
+
+    vertices = np.zeros((target_points.shape[0], 3), dtype=np.intp)
+    weights = np.full((target_points.shape[0], 3), np.nan)
+
+    transform = tri.transform[simplex[inside]]
+    bary = np.einsum('ijk,ik->ij', transform[:, :2], target_points[inside] - transform[:, 2])
+    vertices[inside] = tri.simplices[simplex[inside]]
+    weights[inside, :2] = bary
+    weights[inside, 2] = 1.0 - bary.sum(axis=1)
+
+    return src_points, vertices, weights
+
+
+def _grid_fp(lat, lon):
+    """
+    Cheap fingerprint of a lat/lon grid: shapes plus first and last coordinates.
+    """
+    return (lat.shape, lon.shape,
+            float(lat.flat[0]), float(lat.flat[-1]), float(lon.flat[0]), float(lon.flat[-1]))
+
+
+def _fp_match(fp_a, fp_b):
+    """
+    True if two grid fingerprints have the same shapes and close corner coordinates.
+    """
+    return fp_a[:2] == fp_b[:2] and np.allclose(fp_a[2:], fp_b[2:])
+
+
+def _grid_sample(a):
+    """
+    Strided view of a coordinate array with about 64 samples per dimension.
+    """
+    return a[tuple(slice(None, None, max(1, n // 64)) for n in a.shape)]
+
+
+def _get_plan(src_lats, src_lons, target_file):
+    """
+    Return the cached interpolation plan for a source grid and target file,
+    building it on first use. `None` is returned when the grids are identical.
+
+    Cached plans are looked up by grid fingerprint and confirmed on a strided
+    sample of the coordinates, so a lookup touches O(1) elements instead of
+    comparing or hashing the full grids.
+    """
+    key = (target_file, _grid_fp(src_lats, src_lons))
+
+    with _PLAN_LOCK:
+        entry = _PLAN_CACHE.get(key)
+        if entry is not None:
+            _PLAN_CACHE.move_to_end(key)
+    if entry is not None:
+        lat_sample, lon_sample, plan = entry
+        if (np.array_equal(_grid_sample(src_lats), lat_sample)
+                and np.array_equal(_grid_sample(src_lons), lon_sample)):
+            return plan
+
+    target_grid = _target_grid(target_file)
+    target_lat_grid, target_lon_grid = target_grid[..., 0], target_grid[..., 1]
+
+    # Check if the target grid is identical to the source grid; the full comparison
+    # only runs when the fingerprints agree, and only once per source grid.
+    plan = None
+    if not (_fp_match(key[1], _grid_fp(target_lat_grid, target_lon_grid))
+            and np.allclose(src_lats, target_lat_grid) and np.allclose(src_lons, target_lon_grid)):
+        target_points = target_grid.reshape(-1, 2)
+        src_points, vertices, weights = _build_plan(src_lats, src_lons, target_points)
+        plan = {
+            "src_points": src_points,
+            "target_points": target_points,
+            "vertices": vertices,
+            "weights": {weights.dtype: weights},  # Barycentric weights, per computation dtype
+            "matrix": {},  # Weights as sparse matrices per dtype, used when Numba is unavailable
+            "shape": target_grid.shape[:2],
+            "tree": None,  # KD-tree over src_points, built on the first nearest-neighbour fill
+        }
+
+    with _PLAN_LOCK:
+        _PLAN_CACHE[key] = (_grid_sample(src_lats).copy(), _grid_sample(src_lons).copy(), plan)
+        _PLAN_CACHE.move_to_end(key)
+        while len(_PLAN_CACHE) > _PLAN_CACHE_SIZE:
+            _PLAN_CACHE.popitem(last=False)
+    return plan
+
+
+def build_regridder(src_lats, src_lons, target_file, dtype=np.float64):
+    """
+    Prepare the interpolation from a source grid to the target grid of target_file.
+
+    The triangulation and weights are built on first use and cached per process, so
+    building a regridder for a grid that was already seen only costs a lookup.
+
+    Parameters:
+    - src_lats (numpy.ndarray): Source latitude array (2D).
+    - src_lons (numpy.ndarray): Source longitude array (2D).
+    - target_file (str): Path to the file containing the target grid (see interpolate_to_target_grid).
+    - dtype (numpy.dtype, optional): Precision of the interpolation and of the result; defaults to float64.
+
+    Returns:
+    - callable: regrid(src_data) returning the field on the target grid, or src_data itself
+      if the target grid matches the source grid.
+    """
+
+    src_lats = np.asarray(src_lats)
+    src_lons = np.asarray(src_lons)
+    if np.min(src_lons) < 0:
+        src_lons = np.where(src_lons < 0, src_lons + 360, src_lons)  # Convert from [-180, 180] to [0, 360]
+
+    plan = _get_plan(src_lats, src_lons, target_file)
+    if plan is None:
+        # No interpolation needed; return the original data.
+        return lambda src_data: src_data
+
+    dtype = np.dtype(dtype)
+    if dtype not in plan["weights"]:
+        plan["weights"][dtype] = plan["weights"][np.dtype(np.float64)].astype(dtype)
+    weights = plan["weights"][dtype]
+
+    # Without Numba the weights are applied as a sparse matrix, built once per plan and dtype
+    matrix = None
+    if not HAS_NUMBA:
+        if dtype not in plan["matrix"]:
+            plan["matrix"][dtype] = _weight_matrix(plan["vertices"], weights, plan["src_points"].shape[0])
+        matrix = plan["matrix"][dtype]
+
+    def regrid(src_data):
+        # Flatten the source data and apply the linear interpolation weights.
+        src_values = np.asarray(src_data).ravel()
+        interpolated_flat = _apply_weights(src_values, plan["vertices"], weights, matrix)
+
+        # For any points where linear interpolation returns NaN, use nearest-neighbor interpolation.
+        # Only the NaN points are queried, against a KD-tree cached with the plan.
+        mask_nan = np.isnan(interpolated_flat)
+        if np.any(mask_nan):
+            if plan["tree"] is None:
+                plan["tree"] = cKDTree(plan["src_points"])
+            _, idx = plan["tree"].query(plan["target_points"][mask_nan])
+            interpolated_flat[mask_nan] = src_values[idx]
+
+        # Reshape the interpolated data to match the target grid shape.
+        return interpolated_flat.reshape(plan["shape"])
+
+    return regrid
+
+
+def interpolate_to_target_grid(src_data, src_lats, src_lons, target_file, dtype=np.float64):
+    """
+    Interpolate data from a source grid (lat/lon) to a target grid extracted from a
+    NetCDF file or Zarr dataset, but only perform interpolation if the target grid is
+    different from the source grid.
+
+    The triangulation of the source grid is computed once per (source grid, target file)
+    pair and reused; only the weighted sum is evaluated on subsequent calls. Use
+    build_regridder to interpolate several fields on the same source grid.
+
+    Parameters:
+    - src_data (numpy.ndarray): Source data array (2D).
+    - src_lats (numpy.ndarray): Source latitude array (2D).
+    - src_lons (numpy.ndarray): Source longitude array (2D).
+    - target_file (str): Path to the file containing the target grid. If the path is a directory,
+      it is assumed to be a Zarr dataset; otherwise, it is assumed to be a NetCDF file.
+      The dataset is expected to have variables 'latitude' (or 'lat') and 'longitude' (or 'lon').
+    - dtype (numpy.dtype, optional): Precision of the interpolation and of the result. float32
+      halves the memory traffic of the weighted sum; defaults to float64.
+
+    Returns:
+    - numpy.ndarray: Interpolated data on the target grid, or the original src_data if the
+      target grid matches the source grid.
+    """
+    return build_regridder(src_lats, src_lons, target_file, dtype)(src_data)
@@ -1,17 +1,54 @@
-from multiprocessing import Pool
-from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import queue
+import threading
 from vcast.processing import interpolate_to_target_grid
-from vcast.stat import compute_bias, compute_correlation, compute_csi, compute_far,compute_fss, \
-                       compute_gss,compute_mae,compute_pod,compute_quantiles,compute_rmse, \
+from vcast.processing.interpolation import _load_target_grid, _share_target_grid, _attach_target_grid, \
+                                          _use_serial_kernel, _warm_up
+from vcast.stat import compute_bulk, compute_correlation, compute_csi, compute_far,compute_fss, compute_fss_windows, \
+                       compute_gss,compute_pod,compute_quantiles, \
                        compute_scores,compute_stdev,compute_success_ratio, compute_fbias
 from vcast.stat import compute_fss_ensemble, compute_reliability
 from vcast.io import Preprocessor
 import numpy as np
 import logging
 import math
+import os
+from functools import lru_cache
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 
+# Read-only state shared by all tasks of a worker process, set once by _init_worker
+# so the configuration is not pickled again for every task.
+_CONFIG = None
+_TEST = False
+_STAT_PIPELINE = None
+_STAT_SET = None
+
+# Metrics derived from the contingency table returned by compute_scores
+_SCORE_METRICS = frozenset(["gss", "fbias", "pod", "far", "csi", "sr"])
+
+# Metrics reduced from one shared forecast-minus-reference field by compute_bulk
+_BULK_METRICS = frozenset(["rmse", "bias", "mae"])
+
+# Kinds of metric in a parsed pipeline, so the worker dispatches on a small int
+_BULK, _SCORE, _FIELD, _FSS = 0, 1, 2, 3
+
+# The other deterministic metrics by name, called as fn(fcst, ref, (p1, p2, p3), scores) where
+# scores is the (hits, misses, false_alarms, correct_rejections, total_events)
+# contingency table for the metrics in _SCORE_METRICS, None otherwise.
+_METRIC_FNS = {
+    'quantiles': lambda f, r, p, s: compute_quantiles(f, r),
+    'corr': lambda f, r, p, s: compute_correlation(f, r),
+    'stdev': lambda f, r, p, s: compute_stdev(f, r),
+    'gss': lambda f, r, p, s: compute_gss(s[0], s[1], s[2], s[4]),
+    'fbias': lambda f, r, p, s: compute_fbias(s[0], s[2], s[1]),
+    'pod': lambda f, r, p, s: compute_pod(s[0], s[1]),
+    'far': lambda f, r, p, s: compute_far(s[0], s[2]),
+    'csi': lambda f, r, p, s: compute_csi(s[0], s[1], s[2]),
+    'sr': lambda f, r, p, s: compute_success_ratio(s[0], s[2]),
+    'fss': lambda f, r, p, s: compute_fss(f, r, p[0], p[1], int(p[2])),
+}
+
 def truncate_to_10_decimals(value):
     """
     Truncate a number or a list of numbers to 10 decimal places without rounding.
@@ -34,159 +71,239 @@ def truncate_to_10_decimals(value):
         return math.trunc(num_f * 1e10) / 1e10
 
     if isinstance(value, list):
-        return [truncate_to_10_decimals(item) for item in value]
+        # One vectorized pass; np.trunc keeps NaN as NaN
+        return (np.trunc(np.asarray(value, dtype=np.float64) * 1e10) / 1e10).tolist()
     elif isinstance(value, (int, float, np.floating)):
         return _truncate(value)
     else:
         raise TypeError("Input must be a number or a list of numbers.")
 
-def process_deterministic_multiprocessing(date, lead_time, member, test, config):
+def _parse_stats(stat_name):
     """
-    Processes a single date entry in parallel using multiprocessing.
-    
+    Parse the configured metric strings once and resolve each one to its
+    computation, so the workers do no string handling per task.
+
     Args:
-        date (datetime): The date to process.
-        fcst_file (str): Path to the forecast file.
-        ref_file (str): Path to the reference file.
+        stat_name (list): Metric specifiers from the configuration (e.g. "fss:20:20:1").
+
+    Returns:
+        tuple: (kind, var, (p1, p2, p3), fn) per metric, in configuration order, where
+            kind is _BULK, _SCORE, _FSS or _FIELD and fn is the _METRIC_FNS entry (None for _BULK).
+
+    Raises:
+        Exception: If the parameters of a metric are not properly specified.
+    """
+    pipeline = []
+    for stat in stat_name:
+        var, p1, p2, p3 = Preprocessor.parse_metric_string(stat)
+        if var in _BULK_METRICS:
+            kind = _BULK
+        elif var in _SCORE_METRICS:
+            if p1 is None or p2 is None:
+                raise Exception(f"Parameters for {var} are not properly specified.")
+            kind = _SCORE
+        else:
+            if var == 'fss' and (p1 is None or p2 is None or p3 is None):
+                raise Exception(f"Parameters for {var} are not properly specified.")
+            kind = _FSS if var == 'fss' else _FIELD
+        pipeline.append((kind, var, (p1, p2, p3), _METRIC_FNS.get(var)))
+    return tuple(pipeline)
+
+def _read_cached(input_file, var_name, type_of_level, level, date, lead_time):
+    """
+    Preprocessor.read_input_data, cached per worker so a file shared by several tasks
+    (e.g. the reference file of every member) is read only once.
+
+    Only Zarr stores (directories) are read by date and lead time; any other file
+    holds a single field, so its cache entry is shared by every date and lead time
+    that maps to it (e.g. a reference valid time reached from several cycles).
+
+    The cached arrays are shared between tasks and are returned read-only.
+    """
+    if not os.path.isdir(input_file):
+        date = lead_time = None
+    return _read_file(input_file, var_name, type_of_level, level, date, lead_time)
+
+@lru_cache(maxsize=8)
+def _read_file(input_file, var_name, type_of_level, level, date, lead_time):
+    """
+    Cached read behind _read_cached; date and lead_time are None for single-field files.
+    """
+    data, lats, lons, stype = Preprocessor.read_input_data(input_file, var_name, type_of_level, level, date, lead_time)
+    for array in (data, lats, lons):
+        array.flags.writeable = False
+    return data, lats, lons, stype
+
+def _deterministic_stats(date, lead_time, member, fcst_data, ref_data, test, config, stat_pipeline):
+    """
+    Compute the configured statistics of one forecast against its reference.
+
+    Args:
+        date (datetime): The date being processed.
+        lead_time (int): The forecast lead time.
+        member (str): The forecast member.
+        fcst_data (numpy.ndarray): Forecast field, interpolated if enabled.
+        ref_data (numpy.ndarray): Reference field on the same grid.
+        test (bool): Whether the run is in test mode.
         config (ConfigLoader): Configuration object.
-    
+        stat_pipeline (tuple): Metrics parsed by _parse_stats.
+
     Returns:
-        list: Processed statistics for the given date.
+        list: The output row for the forecast.
     """
-    try:
-        
-        fcst_file = Preprocessor.format_file_template(config.fcst_file_template, date, member, lead_time)
-        ref_file = Preprocessor.format_file_template(config.ref_file_template, date, member, lead_time)
-        
-        logging.info(f"Processing {date} with lead time {lead_time} for member {member}")
-
-        # Read forecast and reference data
-        fcst_data, flats, flons, _ = Preprocessor.read_input_data(
-            fcst_file, config.fcst_var, config.fcst_type_of_level, config.fcst_level, date, lead_time
-        )
-        ref_data, rlats, rlons, _ = Preprocessor.read_input_data(
-            ref_file, config.ref_var, config.ref_type_of_level, config.ref_level, date, lead_time
-        )
-        
-        # Apply interpolation if enabled
-        if config.interpolation:
-            fcst_interpolated_data = interpolate_to_target_grid(fcst_data, flats, flons, config.target_grid) 
-            ref_interpolated_data = interpolate_to_target_grid(ref_data, rlats, rlons, config.target_grid)
+    stats = [date, lead_time]
+    if config.cmem:
+        stats += [member]
+
+    # Contingency tables, shared by the metrics using the same threshold/radius
+    scores = {}
+
+    # Difference-based metrics, computed together on first use
+    bulk = None
+
+    # FSS values by (fcst, ref) thresholds and window size; all the window sizes of a
+    # threshold pair are computed together, sharing the event fields and their tables
+    fss = {}
+
+    # Statistic values of the row, in configuration order
+    values = []
+
+    # Add computed statistics
+    for kind, var, params, fn in stat_pipeline:
+
+        if kind == _BULK:
+            if bulk is None:
+                bulk = compute_bulk(fcst_data, ref_data, [v for k, v, _, _ in stat_pipeline if k == _BULK])
+            tstat = bulk[var]
+        elif kind == _SCORE:
+            if params not in scores:
+                scores[params] = compute_scores(fcst_data, ref_data, params[0], params[1], int(params[2]))
+            tstat = fn(fcst_data, ref_data, params, scores[params])
+        elif kind == _FSS:
+            thresholds = params[:2]
+            if thresholds not in fss:
+                windows = [int(p[2]) for k, _, p, _ in stat_pipeline if k == _FSS and p[:2] == thresholds]
+                fss[thresholds] = dict(zip(windows, compute_fss_windows(fcst_data, ref_data, *thresholds, windows)))
+            tstat = fss[thresholds][int(params[2])]
         else:
-            fcst_interpolated_data = fcst_data
-            ref_interpolated_data = ref_data
+            tstat = fn(fcst_data, ref_data, params, None)
 
-        # Compute statistics
-        stats = [date, lead_time]
-        if config.cmem:
-            stats += [member]
-        
-        stat_names = []
-        parm1 = []
-        parm2 = []
-        parm3 = []
-        for stat in config.stat_name:
-            s, p1, p2, p3 = Preprocessor.parse_metric_string(stat)
-            stat_names.append(s)
-            parm1.append(p1)
-            parm2.append(p2)
-            parm3.append(p3)
-
-        # Add computed statistics
-        for i, var in enumerate(stat_names):
-            p1 = parm1[i]
-            p2 = parm2[i]
-            p3 = parm3[i]
-
-            if var in ["gss", "fbias", "pod", "far", "csi", "sr"]:
-                if p1 is None or p2 is None:
-                    raise Exception(f"Parameters for {var} are not properly specified.")
-                hits, misses, false_alarms, _, total_events = compute_scores(
-                fcst_interpolated_data, ref_interpolated_data, p1, p2, int(p3))
-
-            if var == 'rmse':
-                tstat = compute_rmse(fcst_interpolated_data, ref_interpolated_data)
-            elif var == 'bias':
-                tstat = compute_bias(fcst_interpolated_data, ref_interpolated_data)
-            elif var == 'quantiles':
-                tstat = compute_quantiles(fcst_interpolated_data, ref_interpolated_data)
-            elif var == 'mae':
-                tstat = compute_mae(fcst_interpolated_data, ref_interpolated_data)
-            elif var == 'corr':
-                tstat = compute_correlation(fcst_interpolated_data, ref_interpolated_data)
-            elif var == 'stdev':
-                tstat = compute_stdev(fcst_interpolated_data, ref_interpolated_data)
-            elif var == 'gss':
-                tstat = compute_gss(hits, misses, false_alarms, total_events)
-            elif var == 'fbias':
-                tstat = compute_fbias(hits, false_alarms, misses)
-            elif var == 'pod':
-                tstat = compute_pod(hits, misses)
-            elif var == 'far':
-                tstat = compute_far(hits, false_alarms)
-            elif var == 'csi':
-                tstat = compute_csi(hits, misses, false_alarms)
-            elif var == 'sr':
-                tstat = compute_success_ratio(hits, false_alarms)
-            elif var == 'fss':
-                if p1 is None or p2 is None or p3 is None:
-                    raise Exception(f"Parameters for {var} are not properly specified.")
-                tstat = compute_fss(fcst_interpolated_data, ref_interpolated_data, p1, p2, int(p3))
-
-            if test:
-                tstat = truncate_to_10_decimals(tstat)
-    
-            if isinstance(tstat, list):
-                stats.extend(tstat)
-            else:
-                stats.append(tstat)
-            
-        logging.info(f"Completed processing for {date} with lead time {lead_time} for member {member}")
+        if isinstance(tstat, list):
+            values.extend(tstat)
+        else:
+            values.append(tstat)
 
-        return stats
+    # Truncate the whole row in one vectorized pass rather than value by value
+    if test:
+        values = truncate_to_10_decimals(values)
 
-    except Exception as e:
-        logging.exception(f"Error processing {date}")
-        return None  # Return None for failed entries
+    return stats + values
+
+def _read_interpolated(input_file, var_name, type_of_level, level, date, lead_time, config):
+    """
+    Read a field and interpolate it to the target grid if interpolation is enabled.
+    """
+    data, lats, lons, _ = _read_cached(input_file, var_name, type_of_level, level, date, lead_time)
+    if config.interpolation:
+        return interpolate_to_target_grid(data, lats, lons, config.target_grid, config.interpolation_dtype)
+    return data
+
+def _reference_field(ref_file, date, lead_time, config):
+    """
+    Reference field on the target grid, cached per worker.
 
-def process_ensemble_multiprocessing(date,lead_time,config):
+    The same reference file is verified against every member, and against every
+    cycle with the same valid time, so it is read and interpolated once and the
+    read-only result is shared by those tasks (and by all threads of the thread backend).
+    """
+    if not os.path.isdir(ref_file):
+        date = lead_time = None  # Only Zarr stores are selected by date and lead time
+    return _interpolated_reference(ref_file, date, lead_time, config)
 
-            ensembles = []
+@lru_cache(maxsize=4)
+def _interpolated_reference(ref_file, date, lead_time, config):
+    """
+    Cached read and interpolation behind _reference_field.
+    """
+    ref_data = _read_interpolated(
+        ref_file, config.ref_var, config.ref_type_of_level, config.ref_level, date, lead_time, config
+    )
+    ref_data.flags.writeable = False
+    return ref_data
 
-            ustat_name = [s.lower() for s in config.stat_name]
+def process_deterministic_group(date, lead_time, members, test, config, stat_pipeline=None):
+    """
+    Processes all members of a (date, lead time) pair in one call, so the
+    reference field is read and interpolated once rather than once per member.
+
+    Args:
+        date (datetime): The date to process.
+        lead_time (int): The forecast lead time.
+        members (list): The forecast members to verify.
+        test (bool): Whether the run is in test mode.
+        config (ConfigLoader): Configuration object.
+        stat_pipeline (tuple, optional): Metrics already parsed by _parse_stats.
+            Parsed from config.stat_name when not given.
+
+    Returns:
+        list: One row of statistics per member; failed members are logged and left out.
+    """
+    if stat_pipeline is None:
+        stat_pipeline = _parse_stats(config.stat_name)
+
+    rows = []
+
+    for member in members:
+        try:
+
+            fcst_file = Preprocessor.format_file_template(config.fcst_file_template, date, member, lead_time)
+            ref_file = Preprocessor.format_file_template(config.ref_file_template, date, member, lead_time)
+
+            logging.info(f"Processing {date} with lead time {lead_time} for member {member}")
+
+            # Read forecast and reference data, applying interpolation if enabled
+            fcst_interpolated_data = _read_interpolated(
+                fcst_file, config.fcst_var, config.fcst_type_of_level, config.fcst_level, date, lead_time, config
+            )
+            ref_interpolated_data = _reference_field(ref_file, date, lead_time, config)
+
+            rows.append(_deterministic_stats(date, lead_time, member, fcst_interpolated_data, ref_interpolated_data,
+                                             test, config, stat_pipeline))
+
+            logging.info(f"Completed processing for {date} with lead time {lead_time} for member {member}")
+
+        except Exception as e:
+            logging.exception(f"Error processing {date}")
+
+    return rows
+
+def process_ensemble_multiprocessing(date,lead_time,config,stat_set=None):
+
+            ustat_name = stat_set if stat_set is not None else frozenset(s.lower() for s in config.stat_name)
             stats = [date, lead_time]
 
             ref_file = Preprocessor.format_file_template(config.ref_file_template, date, 0, lead_time)
 
-            ref_data, rlats, rlons, rtype = Preprocessor.read_input_data(
-                ref_file, config.ref_var, config.ref_type_of_level, config.ref_level, date
-            )
-            
-            if config.interpolation:
-                ref_interpolated_data = interpolate_to_target_grid(ref_data, rlats, rlons, config.target_grid)
-            else:
-                ref_interpolated_data = ref_data
+            # Read reference data, applying interpolation if enabled
+            ref_interpolated_data = _reference_field(ref_file, date, lead_time, config)
 
-            for member in config.members:
+            # Members are written straight into one (n_members, ny, nx) array,
+            # allocated once the first member's grid is known
+            ensembles_arr = None
+
+            for i, member in enumerate(config.members):
 
-                fcst_date = date
-                
                 fcst_file = Preprocessor.format_file_template(config.fcst_file_template, date, member, lead_time)
 
-                # Read forecast and reference data
-                fcst_data, flats, flons, _ = Preprocessor.read_input_data(
-                    fcst_file, config.fcst_var, config.fcst_type_of_level, config.fcst_level, fcst_date
+                # Read forecast data, applying interpolation if enabled
+                fcst_interpolated_data = _read_interpolated(
+                    fcst_file, config.fcst_var, config.fcst_type_of_level, config.fcst_level, date, lead_time, config
                 )
 
-                # Apply interpolation if enabled
-                if config.interpolation:
-                    fcst_interpolated_data = interpolate_to_target_grid(fcst_data, flats, flons, config.target_grid) 
-                else:
-                    fcst_interpolated_data = fcst_data
-                
-                ensembles.append(fcst_interpolated_data)
-
-            ensembles_arr = np.array(ensembles)
+                if ensembles_arr is None:
+                    ensembles_arr = np.empty((len(config.members),) + fcst_interpolated_data.shape,
+                                             dtype=fcst_interpolated_data.dtype)
+                ensembles_arr[i] = fcst_interpolated_data
             
             if 'fss' in ustat_name:
                 tstat = compute_fss_ensemble(ensembles_arr, ref_interpolated_data, config.var_threshold, config.var_radius)
@@ -196,43 +313,188 @@ def process_ensemble_multiprocessing(date,lead_time,config):
 
             return stats
 
+def _init_worker(config, test, stat_pipeline, stat_set, target_shm=None):
+    """
+    Worker initializer: store the configuration and the parsed metrics in the
+    worker and load the target grid once so it is not re-read for every task.
+
+    Args:
+        config (ConfigLoader): Configuration object.
+        test (bool): Whether the run is in test mode.
+        stat_pipeline (tuple): Metrics parsed once by the parent with _parse_stats.
+        stat_set (frozenset): Lowercased metric names, for the ensemble statistics.
+        target_shm (tuple, optional): (name, shape) of the target grid published in
+            shared memory by the parent; the grid is read from file when not given.
+    """
+    global _CONFIG, _TEST, _STAT_PIPELINE, _STAT_SET
+    _CONFIG = config
+    _TEST = test
+    _STAT_PIPELINE = stat_pipeline
+    _STAT_SET = stat_set
+
+    if config.interpolation:
+        if target_shm is not None:
+            _attach_target_grid(config.target_grid, *target_shm)
+        else:
+            _load_target_grid(config.target_grid)
+        if config.backend != "thread" and config.processes > 1:
+            # One worker process (or MPI rank) per core already: no Numba thread pool each
+            _use_serial_kernel()
+        _warm_up(config.interpolation_dtype)
+
+def _run_task(task):
+    """
+    Run a single task in a worker using the configuration set by _init_worker.
+
+    Args:
+        task (tuple): (date, lead_times, members) for deterministic statistics,
+            (date, lead_times) for ensemble statistics.
+
+    Returns:
+        list: The rows of statistics produced by the task, in lead time order.
+    """
+    rows = []
+    date, lead_times = task[:2]
+    members = task[2] if _CONFIG.stat_type == "det" else _CONFIG.members
+
+    # Start reading all the files of the task before decoding the first one
+    Preprocessor.prefetch_files(
+        Preprocessor.format_file_template(template, date, member, lead_time)
+        for lead_time in lead_times
+        for member in members
+        for template in (_CONFIG.ref_file_template, _CONFIG.fcst_file_template)
+    )
+
+    if _CONFIG.stat_type == "det":
+        for lead_time in lead_times:
+            rows.extend(process_deterministic_group(date, lead_time, members, _TEST, _CONFIG, _STAT_PIPELINE))
+        return rows
+    for lead_time in lead_times:
+        row = process_ensemble_multiprocessing(date, lead_time, _CONFIG, _STAT_SET)
+        if row is not None:
+            rows.append(row)
+    return rows
+
+def _writer_loop(rows, output, errors):
+    """
+    Write the rows put on the queue until a None sentinel arrives, flushing
+    whenever the queue runs empty rather than after every row.
+
+    Args:
+        rows (queue.Queue): Rows to write, followed by None.
+        output (OutputFileHandler): Output file handler, used only by this thread.
+        errors (list): Receives the exception if writing fails.
+    """
+    try:
+        while True:
+            row = rows.get()
+            if row is None:
+                break
+            output.write_to_output_file(row, flush=False)
+            if rows.empty():
+                output.flush()
+    except Exception as e:
+        errors.append(e)
+        # Keep draining so the producer never blocks on a full queue
+        while rows.get() is not None:
+            pass
+    finally:
+        output.flush()
+
 def process_in_parallel(config, output, test):
     """
-    Process all dates in parallel using multiprocessing.
+    Process all dates in parallel using a process pool executor, a thread
+    pool executor when config.backend is "thread", or an MPI pool executor
+    (mpi4py.futures) when it is "mpi".
+
+    Each task covers all lead times of a date when there are enough dates to keep
+    every worker busy, and a single (date, lead time) otherwise. Rows are handed to
+    a writer thread as soon as they are available and written in the same order
+    as the tasks.
     
     Args:
-        dates (list): List of datetime objects.
-        fcst_files (list): Forecast file paths.
-        ref_files (list): Reference file paths.
         config (ConfigLoader): Configuration object.
         output (OutputFileHandler): Output file handler.
+        test (bool): Whether the run is in test mode.
     """
 
     tasks = []
 
     dates = Preprocessor.dates_to_list(config.start_date, config.end_date, config.interval_hours)
 
+    # Whole dates keep each worker's caches hot across its lead times and members;
+    # split them by lead time only when there are too few dates to balance the load.
+    if len(dates) >= config.processes * 4:
+        lead_time_groups = [tuple(config.lead_times)]
+    else:
+        lead_time_groups = [(lead_time,) for lead_time in config.lead_times]
+
     if config.stat_type == "det":
-        worker_function = partial(process_deterministic_multiprocessing, config=config)
         for date in dates:
-            for lead_time in config.lead_times:
-                for member in config.members:    
-                    task = (date,lead_time,member,test)
-                    tasks.append(task)
+            for lead_times in lead_time_groups:
+                # All members of a (date, lead time) share the reference field
+                task = (date,lead_times,config.members)
+                tasks.append(task)
 
     elif config.stat_type == "ens":
-        worker_function = partial(process_ensemble_multiprocessing, config=config)
         for date in dates:
-            for lead_time in config.lead_times:
-                task = (date,lead_time)
+            for lead_times in lead_time_groups:
+                task = (date,lead_times)
                 tasks.append(task)
     
     else:
         raise Exception("Process execution failed.")
 
-    with Pool(processes=config.processes) as pool:
-        results = pool.starmap(worker_function, tasks)
-        for row in results:
-            if row is not None:
-                output.write_to_output_file(row)
+    # Parse the metrics once here; the workers only look them up
+    stat_pipeline = _parse_stats(config.stat_name) if config.stat_type == "det" else None
+    stat_set = frozenset(s.lower() for s in config.stat_name)
+
+    # Amortize dispatch over several tasks per message while keeping every worker fed
+    chunksize = max(1, len(tasks) // (config.processes * 4))
+
+    shm, initargs = None, (config, test, stat_pipeline, stat_set)
+    if config.backend == "thread":
+        # Reading, interpolation and the statistics release the GIL, so threads share
+        # one copy of the configuration, target grid and dataset caches.
+        _init_worker(*initargs)
+        executor = ThreadPoolExecutor(max_workers=config.processes)
+    elif config.backend == "mpi":
+        # Workers are MPI ranks, possibly on other nodes, so each one loads the target
+        # grid itself; launch with e.g. `mpiexec -n 5 python -m mpi4py.futures ...`.
+        try:
+            from mpi4py.futures import MPIPoolExecutor
+        except ImportError:
+            raise ImportError("The 'mpi' backend requires mpi4py: pip install vcast[mpi]")
+        executor = MPIPoolExecutor(max_workers=config.processes, initializer=_init_worker,
+                                   initargs=initargs)
+    else:
+        # Read the target grid once here and let the workers attach to it.
+        if config.interpolation:
+            shm, shape = _share_target_grid(config.target_grid)
+            initargs += ((shm.name, shape),)
+        # The configuration reaches each worker once, through the initializer,
+        # and the tasks themselves are bare tuples.
+        executor = ProcessPoolExecutor(max_workers=config.processes, initializer=_init_worker,
+                                       initargs=initargs)
+
+    # The output file is written by its own thread, so collecting results never waits on disk
+    pending, errors = queue.Queue(maxsize=1024), []
+    writer = threading.Thread(target=_writer_loop, args=(pending, output, errors), daemon=True)
+    writer.start()
+
+    try:
+        with executor:
+            for rows in executor.map(_run_task, tasks, chunksize=chunksize):
+                if errors:
+                    break
+                for row in rows:
+                    pending.put(row)
+    finally:
+        pending.put(None)
+        writer.join()
+        if shm is not None:
+            shm.close()
+            shm.unlink()
 
+    if errors:
+        raise errors[0]
@@ -1,6 +1,85 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from typing import Tuple, Literal
+from vcast._jit import njit, prange, HAS_NUMBA
+
+# Bootstrap samples are drawn in blocks of about this many indices (16 MB of int32)
+_BOOTSTRAP_BLOCK_ELEMENTS = 1 << 22
+
+@njit(parallel=True, fastmath={"reassoc", "contract"}, cache=True, nogil=True)
+def _bootstrap_kernel(diff, seeds, out):
+    """
+    Bootstrap means of `diff`: out[i] is the mean of len(diff) values drawn with
+    replacement, using a splitmix64 stream seeded by seeds[i]. The indices are
+    generated, gathered and summed in one loop, without temporaries.
+    """
+    n = diff.size
+    for i in prange(out.size):
+        state = seeds[i]
+        total = 0.0
+        for _ in range(n):
+            state += np.uint64(0x9E3779B97F4A7C15)
+            z = state
+            z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            z = z ^ (z >> np.uint64(31))
+            total += diff[z % np.uint64(n)]
+        out[i] = total / n
+
+def pairwise_bootstrap_significance(
+    metric_a: np.ndarray,
+    metric_b: np.ndarray,
+    n_iterations: int = 10000,
+    ci_percentile: float = 95.0,
+    seed=None
+) -> Tuple[float, float, Tuple[float, float]]:
+    """
+    Perform pairwise bootstrap significance test and return observed diff, p-value, and CI.
+
+    `seed` is anything accepted by `np.random.default_rng` (e.g. a SeedSequence).
+
+    Returns:
+        Tuple of (observed_diff, p_value, (ci_lower, ci_upper))
+    """
+    metric_a = np.asarray(metric_a)
+    metric_b = np.asarray(metric_b)
+    n = len(metric_a)
+
+    rng = np.random.default_rng(seed)
+
+    # Pairs are (metric_a[i], metric_b[i]) for i < len(metric_a); extra values of metric_b
+    # are not resampled, but still count in its observed mean
+    if len(metric_b) < n:
+        raise ValueError(f"metric_b has {len(metric_b)} values, fewer than the {n} of metric_a to pair with.")
+    diff = np.ascontiguousarray(metric_b[:n] - metric_a, dtype=np.float64)
+    differences = np.empty(n_iterations, dtype=np.float64)
+
+    if HAS_NUMBA and n > 0:
+        # One compiled pass per replicate, each with its own random stream
+        _bootstrap_kernel(diff, rng.bit_generator.random_raw(n_iterations), differences)
+    else:
+        # Draw the bootstrap samples as index matrices and average the paired differences
+        # per row, in blocks of rows so memory stays bounded for large samples
+        block = max(1, _BOOTSTRAP_BLOCK_ELEMENTS // max(n, 1))
+        for start in range(0, n_iterations, block):
+            rows = min(block, n_iterations - start)
+            sample_indices = rng.integers(0, n, size=(rows, n), dtype=np.int32)
+            differences[start:start + rows] = diff[sample_indices].mean(axis=1)
+
+    observed_diff = np.mean(metric_b) - np.mean(metric_a)
+    p_value = np.mean(np.abs(differences) >= np.abs(observed_diff))
+
+    # Both bounds from one selection pass; `differences` is scratch, so partition it in place
+    lower, upper = np.percentile(differences, [(100 - ci_percentile) / 2, 100 - (100 - ci_percentile) / 2],
+                                 overwrite_input=True)
+
+    return observed_diff, p_value, (lower, upper)
+
+def _bootstrap_lead(job):
+    """Run the bootstrap for one lead time; `job` is (values_a, values_b, n_iterations, ci_percentile, seed)."""
+    return pairwise_bootstrap_significance(*job)
 
 class StatiscalSignificance:
 
@@ -11,7 +90,7 @@ class StatiscalSignificance:
         output_file = config.output_file
         metric = config.metric
 
-        df = self.compare_models(df1, df2, metric)
+        df = self.compare_models(df1, df2, metric, processes=getattr(config, "processes", None))
 
         df.to_csv(output_file, sep='\t', index=False, header=True)
 
@@ -20,7 +99,8 @@ class StatiscalSignificance:
         metric_a: np.ndarray,
         metric_b: np.ndarray,
         n_iterations: int = 10000,
-        ci_percentile: float = 95.0
+        ci_percentile: float = 95.0,
+        seed=None
     ) -> Tuple[float, float, Tuple[float, float]]:
         """
         Perform pairwise bootstrap significance test and return observed diff, p-value, and CI.
@@ -28,27 +108,7 @@ class StatiscalSignificance:
         Returns:
             Tuple of (observed_diff, p_value, (ci_lower, ci_upper))
         """
-        metric_a = np.asarray(metric_a)
-        metric_b = np.asarray(metric_b)
-        differences = []
-
-        rng = np.random.default_rng()
-
-        for _ in range(n_iterations):
-            sample_indices = rng.integers(0, len(metric_a), len(metric_a))
-            sample_a = metric_a[sample_indices]
-            sample_b = metric_b[sample_indices]
-            diff = np.mean(sample_b - sample_a)
-            differences.append(diff)
-
-        differences = np.array(differences)
-        observed_diff = np.mean(metric_b) - np.mean(metric_a)
-        p_value = np.mean(np.abs(differences) >= np.abs(observed_diff))
-
-        lower = np.percentile(differences, (100 - ci_percentile) / 2)
-        upper = np.percentile(differences, 100 - (100 - ci_percentile) / 2)
-
-        return observed_diff, p_value, (lower, upper)
+        return pairwise_bootstrap_significance(metric_a, metric_b, n_iterations, ci_percentile, seed)
 
     def compare_models(
         self,
@@ -56,26 +116,47 @@ class StatiscalSignificance:
         df_model_b: pd.DataFrame,
         metric: Literal["rmse", "bias", "fss"] = "rmse",
         n_iterations: int = 10000,
-        ci_percentile: float = 95.0
+        ci_percentile: float = 95.0,
+        processes: int = None
     ) -> pd.DataFrame:
         """
         Compare two models using pairwise bootstrapping by lead time.
 
+        Lead times are independent, so without Numba their bootstraps run in a pool of
+        `processes` workers (default: all but one core). With Numba each bootstrap is
+        already spread over all cores and the leads run one after another. Every lead
+        draws from its own child of one SeedSequence.
+
         Returns:
             DataFrame with lead time, observed difference, p-value, CI, better model, and significance flag.
         """
-        results = []
-        for lead in sorted(set(df_model_a["fcst_lead"]).intersection(df_model_b["fcst_lead"])):
-            values_a = df_model_a[df_model_a["fcst_lead"] == lead][metric].values
-            values_b = df_model_b[df_model_b["fcst_lead"] == lead][metric].values
+        # Split each frame by lead time once instead of masking it for every lead
+        a_groups = {lead: group.values for lead, group in df_model_a.groupby("fcst_lead", sort=False)[metric]}
+        b_groups = {lead: group.values for lead, group in df_model_b.groupby("fcst_lead", sort=False)[metric]}
+
+        leads, jobs = [], []
+        for lead in sorted(a_groups.keys() & b_groups.keys()):
+            values_a = a_groups[lead]
+            values_b = b_groups[lead]
+
+            leads.append(lead)
+            jobs.append((values_a, values_b, n_iterations, ci_percentile))
 
-            if len(values_a) == 0 or len(values_b) == 0:
-                continue
+        seeds = np.random.SeedSequence().spawn(len(jobs))
+        jobs = [job + (seed,) for job, seed in zip(jobs, seeds)]
 
-            obs_diff, p_val, (ci_low, ci_high) = self.pairwise_bootstrap_significance(
-                values_a, values_b, n_iterations=n_iterations, ci_percentile=ci_percentile
-            )
+        if processes is None:
+            processes = max(1, (os.cpu_count() or 1) - 1)
+        processes = min(processes, len(jobs))
 
+        if HAS_NUMBA or processes <= 1:
+            stats = [_bootstrap_lead(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                stats = list(executor.map(_bootstrap_lead, jobs))
+
+        results = []
+        for lead, (obs_diff, p_val, (ci_low, ci_high)) in zip(leads, stats):
             better_model = "Model A" if obs_diff < 0 else "Model B"
             significant = p_val < 0.05
 
@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.signal import convolve2d
+from vcast.stat.stats import _window_counts, _fraction_sums
 
 def compute_reliability(ensemble, obs, threshold, n_bins=10):
     """
@@ -14,32 +14,35 @@ def compute_reliability(ensemble, obs, threshold, n_bins=10):
     Returns:
         bin_centers, observed_frequencies, counts
     """
-    # Step 1: Convert ensemble to binary (event occurrence)
-    binary_ensemble = (ensemble >= threshold).astype(int)  # shape: (10, H, W)
+    n_members = ensemble.shape[0]
 
-    # Step 2: Compute ensemble probability forecast at each grid point
-    forecast_prob = np.mean(binary_ensemble, axis=0)  # shape: (H, W)
+    # Step 1: Count the members forecasting the event at each grid point, in the
+    # smallest integer type that holds n_members (no per-member int copy)
+    count_dtype = np.uint8 if n_members < 256 else np.uint16 if n_members < 65536 else np.int64
+    member_counts = np.sum(ensemble >= threshold, axis=0, dtype=count_dtype)  # shape: (H, W)
 
-    # Step 3: Convert observed reflectivity to binary
-    obs_binary = (obs >= threshold).astype(int)  # shape: (H, W)
+    # Step 2: Convert observed reflectivity to binary
+    obs_binary = (obs >= threshold)  # shape: (H, W)
 
-    # Step 4: Flatten for binning
-    probs_flat = forecast_prob.ravel()
-    obs_flat = obs_binary.ravel()
+    # Step 3: The forecast probability can only be k / n_members, so tally grid
+    # points and observed events per member count in one pass each (integer
+    # counts of the event points rather than a float-weighted bincount)
+    points_per_count = np.bincount(member_counts.ravel(), minlength=n_members + 1)
+    events_per_count = np.bincount(member_counts[obs_binary], minlength=n_members + 1)
 
-    # Step 5: Bin forecast probabilities
+    # Step 4: Bin forecast probabilities, mapping each possible probability to the
+    # bin with bins[i] <= p < bins[i + 1]
     bins = np.linspace(0, 1, n_bins + 1)
     bin_centers = (bins[:-1] + bins[1:]) / 2
-    observed_freqs = np.zeros(n_bins)
-    counts = np.zeros(n_bins)
+    probs = np.arange(n_members + 1) / n_members
+    bin_index = np.searchsorted(bins, probs, side='right') - 1
+    in_range = bin_index < n_bins
 
-    for i in range(n_bins):
-        mask = (probs_flat >= bins[i]) & (probs_flat < bins[i + 1])
-        counts[i] = np.sum(mask)
-        if counts[i] > 0:
-            observed_freqs[i] = np.mean(obs_flat[mask])
-        else:
-            observed_freqs[i] = np.nan  # or 0
+    counts = np.bincount(bin_index[in_range], weights=points_per_count[in_range], minlength=n_bins)
+    events = np.bincount(bin_index[in_range], weights=events_per_count[in_range], minlength=n_bins)
+
+    observed_freqs = np.full(n_bins, np.nan)  # NaN for empty bins
+    np.divide(events, counts, out=observed_freqs, where=counts > 0)
 
     return bin_centers, observed_freqs, counts
 
@@ -68,46 +71,51 @@ def compute_fss_ensemble(forecast_values, reference_values, threshold, window_si
                     or if the window size is invalid.
     """
 
-    # Check for ensemble input: if forecast_values is 3D, compute ensemble probability.
+    # Check for ensemble input: if forecast_values is 3D, the ensemble probability at
+    # each point is the number of members exceeding the threshold over n_members.
     if forecast_values.ndim == 3:
-        # Compute the ensemble probability field: average over the ensemble members.
-        fcst_binary = (forecast_values >= threshold).astype(float)
-        forecast_prob = np.mean(fcst_binary, axis=0)
+        n_members = forecast_values.shape[0]
+        count_dtype = np.uint8 if n_members < 256 else np.uint16 if n_members < 65536 else np.int64
+        member_counts = np.sum(forecast_values >= threshold, axis=0, dtype=count_dtype)
     elif forecast_values.ndim == 2:
-        forecast_prob = (forecast_values >= threshold).astype(float)
+        n_members = 1
+        member_counts = forecast_values >= threshold
     else:
         raise ValueError("Forecast values must be a 2D (deterministic) or 3D (ensemble) array.")
     
 
     # Ensure reference field is binary.
-    if reference_values.shape != forecast_prob.shape:
+    if reference_values.shape != member_counts.shape:
         raise ValueError("Reference values and forecast values (after ensemble reduction) must have the same shape.")
-    ref_binary = (reference_values >= threshold).astype(float)
+    ref_binary = reference_values >= threshold
     
     # If neither field contains events, FSS cannot be computed.
-    if not (np.any(forecast_prob) or np.any(ref_binary)):
+    fcst_any = np.any(member_counts)
+    ref_any = np.any(ref_binary)
+    if not (fcst_any or ref_any):
         return np.nan
     
     if window_size <= 0:
         raise ValueError("Window size must be greater than zero.")
+
+    # With events in only one field the fractions MSE equals the reference MSE
+    # exactly, so the score is 0 (no skill) without computing any window counts.
+    if not (fcst_any and ref_any):
+        return 0.0
     
-    # Define the kernel for neighborhood averaging.
-    kernel = np.ones((window_size, window_size), dtype=float)
-    
-    # Compute the fraction of event occurrence in the neighborhood using 2D convolution.
-    fcst_fractions = convolve2d(forecast_prob, kernel, mode='same', boundary='fill', fillvalue=0)
-    ref_fractions = convolve2d(ref_binary, kernel, mode='same', boundary='fill', fillvalue=0)
+    # Sum the events in the window_size x window_size neighborhood of each point from
+    # summed-area tables, aligned as a centered 'same' convolution with zero fill.
+    before, after = window_size // 2, (window_size - 1) // 2
+    fcst_counts = _window_counts(member_counts, before, after)
+    ref_counts = _window_counts(ref_binary, before, after)
     
-    # Normalize the fractions by the area of the kernel.
+    # Normalize the sums by the area of the kernel (and the ensemble size), and accumulate
+    # the mean square error (MSE) between the forecast and reference fractions together
+    # with the reference MSE (the worst-case scenario) in a single pass.
     kernel_area = window_size ** 2
-    fcst_fractions /= kernel_area
-    ref_fractions /= kernel_area
-    
-    # Calculate the mean square error (MSE) between the forecast and reference fractions.
-    mse_fractions = np.mean((fcst_fractions - ref_fractions) ** 2)
-    
-    # Compute the reference MSE (the worst-case scenario).
-    ref_mse = np.mean(fcst_fractions ** 2) + np.mean(ref_fractions ** 2)
+    sq_diff, sq_sum = _fraction_sums(fcst_counts, ref_counts, 1.0 / (n_members * kernel_area), 1.0 / kernel_area)
+    mse_fractions = sq_diff / fcst_counts.size
+    ref_mse = sq_sum / fcst_counts.size
     if ref_mse == 0:
         return np.nan
     
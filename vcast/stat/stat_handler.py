@@ -1,3 +1,11 @@
+import hashlib
+import io
+import json
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 import pandas as pd
 import glob
 import vcast.stat.constants as cn
@@ -5,62 +13,326 @@ from vcast.stat import AVAILABLE_LINE_TYPES
 import numpy as np
 import logging
 
+# Let the chained filters in run_all share column buffers until something is
+# written. Copy-on-Write is always on from pandas 3.0, where the option is deprecated.
+if int(pd.__version__.split(".")[0]) == 2:
+    pd.set_option("mode.copy_on_write", True)
+
+# Errors of the filters that leave no rows (also raised by ReadStat.apply_filters)
+_DATE_PARSE_ERROR = "All values in column '{}' could not be converted to datetime format."
+_EMPTY_AFTER_DATE = "The DataFrame is empty after applying the date filter."
+_EMPTY_AFTER_STRING = "The DataFrame is empty after applying the string filter."
+_EMPTY_AFTER_THRESHOLD = "The DataFrame is empty after applying threshold filters."
+
+def _write_tsv(df, output_file):
+    """
+    Write `df` as a tab-separated file with a header and no index. Uses the
+    multithreaded pyarrow CSV writer when it is available (with datetime columns
+    formatted as pandas would), falling back to DataFrame.to_csv.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        datetime_columns = df.select_dtypes(include=["datetime", "datetimetz"]).columns
+        if len(datetime_columns):
+            df = df.copy(deep=False)
+            for column in datetime_columns:
+                df[column] = df[column].astype(str)
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with open(output_file, "wb") as file:
+            file.write(("\t".join(map(str, df.columns)) + "\n").encode())
+            pa_csv.write_csv(table, file, write_options=pa_csv.WriteOptions(
+                include_header=False, delimiter="\t", quoting_style="none"))
+    except (ImportError, TypeError, ValueError, NotImplementedError):
+        # No pyarrow, or columns/values it cannot convert or write unquoted
+        df.to_csv(output_file, sep="\t", index=False, header=True)
+
+def _to_numeric(values):
+    """
+    Convert a column of .stat values to numbers, coercing errors to NaN, like
+    pd.to_numeric(values, errors="coerce"). String columns are cast to float64
+    in one vectorized call first; to_numeric is only used when that cast fails
+    (e.g. on 'NA') or when the column may hold integers, which it keeps as int64.
+    """
+    if pd.api.types.is_string_dtype(values):
+        try:
+            converted = values.astype(np.float64)
+        except (TypeError, ValueError):
+            converted = None
+        if converted is not None:
+            data = converted.to_numpy()
+            if not (np.isfinite(data) & (data == np.trunc(data))).all():
+                return converted
+    return pd.to_numeric(values, errors="coerce")
+
+@lru_cache(maxsize=None)
+def _line_type_token(line_type):
+    """Case-insensitive bytes pattern of a line type as a whitespace-separated token."""
+    return re.compile(rb"\s" + re.escape(line_type.encode()) + rb"\s", re.IGNORECASE)
+
+def _mentions_line_type(file_path, line_type):
+    """
+    Cheap prefilter: search the memory-mapped file for the line type token.
+    False positives are fine (the lines are checked afterwards); empty files
+    are reported as matching so the caller handles them as before.
+    """
+    with open(file_path, "rb") as file:
+        try:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _line_type_token(line_type).search(mapped) is not None
+        except ValueError:
+            return True
+
+@lru_cache(maxsize=None)
+def _full_header(line_type, old=False):
+    """Full header of a (lowercase) line type, in the current or the old MET layout."""
+    line_type_columns = cn.LINE_TYPE_COLUMNS_OLD if old else cn.LINE_TYPE_COLUMNS
+    return tuple(cn.FULL_HEADER + line_type_columns.get(line_type, []))
+
+# Part of the .stat cache keys; bump it when the parsed layout of a file changes
+_STAT_CACHE_VERSION = 1
+
+def _cache_path(cache_dir, file_path, line_type):
+    """
+    Parquet cache entry of a .stat file for a line type. The key holds the file's
+    absolute path (hashed), modification time and size, so an edited file misses.
+    """
+    stat = os.stat(file_path)
+    key = hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest()
+    return os.path.join(cache_dir, f"{key}_{stat.st_mtime_ns}_{stat.st_size}_"
+                                   f"{line_type.lower()}_v{_STAT_CACHE_VERSION}.parquet")
+
+def _prefilter(df, date_column=None, date_range=None, string_filters=None, thresholds=None,
+               columns=None):
+    """
+    Drop the rows of one file's DataFrame that the date, string and threshold
+    filters of ReadStat.run_all would drop anyway, and with `columns`, every
+    column not listed. The kept columns keep their dtypes; the filters still
+    run on the combined DataFrame, which gives the same result whether or not
+    it was pruned here first.
+
+    Returns the pruned DataFrame and, when the date filter can be evaluated
+    (`date_range` holds the parsed start and end dates), a dict with the rows
+    left after the date, string and threshold stages ('date', 'string',
+    'threshold'), whether any date could be parsed ('dates_parse') and the
+    filter columns the file does not have ('missing'); otherwise None.
+    """
+    if columns is not None:
+        df = df[[column for column in df.columns if column in columns]]
+
+    if date_range is None or date_column not in df.columns:
+        # Only prune on the columns present; filter_by_date reports the problem
+        mask = np.ones(len(df), dtype=bool)
+        for column, allowed_values in (string_filters or {}).items():
+            if column in df.columns and column != date_column:
+                mask &= df[column].isin(allowed_values).to_numpy()
+        for column, limits in (thresholds or {}).items():
+            if column in df.columns and column != date_column:
+                values = _to_numeric(df[column]).to_numpy(dtype=np.float64)
+                mask &= (values >= limits[0]) & (values <= limits[1])
+        return (df if mask.all() else df[mask]), None
+
+    # The same date selection as filter_by_date: a string range, then the parsed dates
+    start_date, end_date = date_range
+    dates = df[date_column]
+    if pd.api.types.is_string_dtype(dates):
+        in_range = (dates >= start_date.strftime("%Y%m%d_%H%M%S")) & (dates <= end_date.strftime("%Y%m%d_%H%M%S"))
+        df = df[in_range.to_numpy(dtype=bool, na_value=False)]
+    parsed_dates = pd.to_datetime(df[date_column], format="%Y%m%d_%H%M%S", errors="coerce")
+    mask = ((parsed_dates >= start_date) & (parsed_dates <= end_date)).to_numpy(dtype=bool, copy=True)
+    stages = {"date": np.count_nonzero(mask), "dates_parse": True, "missing": set()}
+    if not stages["date"]:
+        # Whether filter_by_date can tell an empty range from a column it cannot parse
+        stages["dates_parse"] = bool(pd.to_datetime(pd.Series(dates.unique()), format="%Y%m%d_%H%M%S",
+                                                    errors="coerce").notna().any())
+
+    # The filters after the date filter see the parsed dates in the date column
+    def column_values(column):
+        return parsed_dates if column == date_column else df[column]
+
+    for column, allowed_values in (string_filters or {}).items():
+        if column in df.columns:
+            mask &= column_values(column).isin(allowed_values).to_numpy()
+        else:
+            stages["missing"].add(column)
+    stages["string"] = np.count_nonzero(mask)
+    for column, limits in (thresholds or {}).items():
+        if column in df.columns:
+            values = _to_numeric(column_values(column)).to_numpy(dtype=np.float64)
+            mask &= (values >= limits[0]) & (values <= limits[1])
+        else:
+            stages["missing"].add(column)
+    stages["threshold"] = np.count_nonzero(mask)
+    return (df if mask.all() else df[mask]), stages
+
+def _process_file(file_path, line_type, cache_dir=None, prefilter=None):
+    """
+    Process one .stat file in a worker process. Returns its DataFrame, the
+    threshold columns found for 'pct'/'pstd' lines (None otherwise), since the
+    worker's ReadStat attributes do not reach the parent, the number of rows
+    parsed and the row counts of the filter stages (see `_prefilter`).
+
+    With `prefilter` (keyword arguments of `_prefilter`), the rows the filters
+    would drop are dropped here, so they are never sent back or concatenated.
+
+    With `cache_dir` (and pyarrow installed), the result is stored there as
+    Parquet and read back instead of parsing the file again while it is
+    unchanged; older entries of the same file and line type are removed.
+    """
+    if cache_dir:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            logging.warning("pyarrow is not installed; not caching %s.", file_path)
+            cache_dir = None
+
+    if cache_dir:
+        cache_path = _cache_path(cache_dir, file_path, line_type)
+        if os.path.exists(cache_path):
+            try:
+                table = pq.read_table(cache_path)
+                column_specific = json.loads(table.schema.metadata.get(b"vcast_column_specific", b"null"))
+                logging.info("Read %s from cache %s.", file_path, cache_path)
+                df = table.to_pandas()
+                return (*_prefilter(df, **(prefilter or {})), column_specific, len(df))
+            except (OSError, ValueError, pa.ArrowException) as e:
+                logging.warning("Ignoring unreadable cache entry %s: %s", cache_path, e)
+
+    reader = ReadStat(None)
+    df = reader.process_file(file_path, line_type)
+    column_specific = getattr(reader, "column_specific", None)
+
+    if cache_dir:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[b"vcast_column_specific"] = json.dumps(column_specific).encode()
+            # Write under a temporary name so a concurrent run never reads a partial file
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            pq.write_table(table.replace_schema_metadata(metadata), tmp_path, compression="zstd")
+            os.replace(tmp_path, cache_path)
+            prefix = os.path.basename(cache_path).split("_", 1)[0]
+            suffix = f"_{line_type.lower()}_v{_STAT_CACHE_VERSION}.parquet"
+            for stale in glob.glob(os.path.join(cache_dir, f"{prefix}_*{suffix}")):
+                if stale != cache_path:
+                    os.remove(stale)
+        except (OSError, pa.ArrowException) as e:
+            logging.warning("Could not cache %s: %s", file_path, e)
+
+    return (*_prefilter(df, **(prefilter or {})), column_specific, len(df))
+
 class ReadStat:
     def __init__(self, config):
         """
         Initialize the class with the configuration file.
         """
 
-        # Configure the logging system
+        # Configure the logging system (debug messages are opt-in, they are
+        # formatted for every file and matching line otherwise)
         logging.basicConfig(
-            level=logging.DEBUG,
+            level=logging.INFO,
             format='%(asctime)s - %(levelname)s - %(message)s'
         )
 
         self.config = config
 
-    def run_all(self):
-        
+    def read_files(self, sfiles, prefilter=None):
+        """
+        Parses the .stat files in parallel (they are independent) and combines
+        them into a single DataFrame, in file order. With `prefilter` (keyword
+        arguments of `_prefilter`), each worker drops the rows the filters
+        would reject. Raises an exception if no file has the line type.
+
+        Returns the DataFrame and the rows left after each filter stage over
+        all files (see `_prefilter`), or None when they are not known exactly:
+        no date range, or a filter column found in some files only.
+        """
         config = self.config
 
-        logging.info("Initializing ReadStat with config: %s", config)
-        if config.line_type.lower() not in AVAILABLE_LINE_TYPES:
-            logging.error("Line type %s not recognized.", config.line_type)
-            raise Exception(f"Line type {config.line_type} not recognized.")
-        
-        sfiles = sorted(glob.glob(f'{config.input_stat_folder}/*.stat'))
-        logging.info("Found %d stat files in %s.", len(sfiles), config.input_stat_folder)
-
-        # Loop through all .stat files
-        for i, file in enumerate(sfiles):
+        processes = getattr(config, "processes", None) or os.cpu_count() or 1
+        processes = min(processes, len(sfiles))
+        read = partial(_process_file, line_type=config.line_type,
+                       cache_dir=getattr(config, "stat_cache_dir", None), prefilter=prefilter)
+        if processes > 1:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = list(executor.map(read, sfiles))
+        else:
+            results = map(read, sfiles)
+
+        # Loop through all .stat files, collecting the frames to concatenate once
+        frames = []
+        n_rows = 0
+        counts, missing = {"date": 0, "dates_parse": False, "string": 0, "threshold": 0}, None
+        for i, (file, (df, stages, column_specific, n_file_rows)) in enumerate(zip(sfiles, results)):
             logging.debug("Processing file %d: %s", i+1, file)
-            df = self.process_file(file, config.line_type)  # Process each file
+            if column_specific is not None:
+                self.column_specific = column_specific
 
-            if i == 0:
-                # Initialize an empty DataFrame with correct headers
-                df_combined = pd.DataFrame(columns=df.columns)
+            if i == 0 and not n_file_rows:
+                # Keep the first file's headers even though it has no rows; otherwise its own
+                # frame comes first, and the parsed (Arrow-backed) string columns are kept
+                frames.append(pd.DataFrame(columns=df.columns))
                 logging.debug("Initialized combined DataFrame with columns: %s", df.columns.tolist())
 
-            # Only concatenate if df is not empty
-            if not df.empty:
-                df_combined = pd.concat([df_combined, df], ignore_index=True)
-                logging.debug("Concatenated file %s; combined DataFrame shape is now %s.", file, df_combined.shape)
+            # Only concatenate if the file had rows; a frame the prefilter emptied is kept
+            # for its columns, as the frame with all its rows would have been
+            if n_file_rows:
+                frames.append(df)
+                n_rows += n_file_rows
+                if counts is not None and stages is not None and missing in (None, stages["missing"]):
+                    for stage in ("date", "string", "threshold"):
+                        counts[stage] += stages[stage]
+                    counts["dates_parse"] |= stages["dates_parse"]
+                    missing = stages["missing"]
+                else:
+                    counts = None
+                logging.debug("Collected file %s with shape %s.", file, df.shape)
             else:
                 logging.warning("File %s produced an empty DataFrame; skipping.", file)
 
-        if df_combined.empty:
+        if n_rows == 0:
             logging.error("All files produced empty DataFrames after filtering by line type.")
             raise ValueError("The DataFrame is empty after the line type filter.")
 
-        df = df_combined
-        logging.info("Combined DataFrame shape after processing files: %s", df.shape)
-        
+        if len(frames) == 1:
+            # A single file already has a fresh RangeIndex; nothing to concatenate
+            df_combined = frames[0]
+        else:
+            df_combined = pd.concat(frames, ignore_index=True)
+
+        logging.info("Combined DataFrame shape after processing files: %s", df_combined.shape)
+        return df_combined, counts
+
+    def apply_filters(self, df, counts=None):
+        """
+        Applies the date filter and, when configured, the string and threshold
+        filters to the combined DataFrame.
+        Raises an exception if any of them leaves it empty. With `counts` (from
+        read_files), the filter that empties the unpruned data is known and
+        raises the same error, even if the workers pruned the rows it would see.
+        """
+        config = self.config
+
+        if counts is not None:
+            if not counts["date"]:
+                message = (_DATE_PARSE_ERROR.format(config.date_column) if not counts["dates_parse"]
+                           else _EMPTY_AFTER_DATE)
+                logging.error("Date filtering resulted in an empty DataFrame.")
+                raise RuntimeError(f"Error in `filter_by_date`: {message}")
+            if config.string_filters and not counts["string"]:
+                logging.error("String filtering resulted in an empty DataFrame.")
+                raise RuntimeError(f"Error in `filter_by_string`: {_EMPTY_AFTER_STRING}")
+            if config.thresholds and not counts["threshold"]:
+                logging.error("Threshold filtering resulted in an empty DataFrame.")
+                raise RuntimeError(f"Error in `filter_by_threshold`: {_EMPTY_AFTER_THRESHOLD}")
+
         df = self.filter_by_date(df, config.date_column, config.start_date, config.end_date)
         logging.info("DataFrame shape after date filtering: %s", df.shape)
         
-        df = df.sort_values(by=config.date_column)
-        logging.debug("DataFrame sorted by %s.", config.date_column)
-
         if config.string_filters:  # Check if self.string_filters is not empty
             df = self.filter_by_string(df, config.string_filters)
             logging.info("DataFrame shape after applying string filters: %s", df.shape)
@@ -69,6 +341,51 @@ class ReadStat:
             df = self.filter_by_threshold(df, config.thresholds)
             logging.info("DataFrame shape after applying threshold filters: %s", df.shape)
 
+        return df
+
+    def run_all(self):
+        
+        config = self.config
+
+        logging.info("Initializing ReadStat with config: %s", config)
+        if config.line_type.lower() not in AVAILABLE_LINE_TYPES:
+            logging.error("Line type %s not recognized.", config.line_type)
+            raise Exception(f"Line type {config.line_type} not recognized.")
+
+        # Optional: precision of the stat var columns, "float64" (default) or "float32"
+        stat_vars_dtype = getattr(config, "stat_vars_dtype", None) or "float64"
+        if stat_vars_dtype not in {"float64", "float32"}:
+            raise ValueError(f"stat_vars_dtype must be either 'float64' or 'float32'. Got: '{stat_vars_dtype}'")
+        
+        sfiles = sorted(glob.glob(f'{config.input_stat_folder}/*.stat'))
+        logging.info("Found %d stat files in %s.", len(sfiles), config.input_stat_folder)
+
+        # The date, string and threshold filters only keep or drop rows, so the workers
+        # drop the rows they would reject (and the columns nothing keeps) before the
+        # files are combined
+        prefilter = {"date_column": config.date_column,
+                     "string_filters": config.string_filters,
+                     "thresholds": config.thresholds}
+        if config.columns_to_keep:
+            # Only these columns survive filter_by_columns; the filters need their own
+            prefilter["columns"] = set(config.columns_to_keep).union(
+                [config.date_column], config.string_filters, config.thresholds)
+        try:
+            date_range = tuple(pd.to_datetime(date, format="%Y-%m-%d_%H:%M:%S")
+                               for date in (config.start_date, config.end_date))
+            if not any(pd.isna(date) for date in date_range):
+                prefilter["date_range"] = date_range
+        except (TypeError, ValueError):
+            pass  # filter_by_date reports the bad date
+
+        df, counts = self.read_files(sfiles, prefilter)
+        df = self.apply_filters(df, counts)
+
+        # Sort once the rows are reduced (before columns_to_keep, which may drop the date column);
+        # a stable sort keeps ties in file order, so filtering first cannot change the result
+        df = df.sort_values(by=config.date_column, kind="stable")
+        logging.debug("DataFrame sorted by %s.", config.date_column)
+
         if config.columns_to_keep:  # Check if self.columns_to_keep is not empty
             df = self.filter_by_columns(df, config.columns_to_keep)
             logging.info("DataFrame shape after filtering by columns: %s", df.shape)
@@ -95,13 +412,16 @@ class ReadStat:
         new_columns = [col.lower() for col in add_columns if col.lower() in df.columns]
         logging.debug("Final list of stat var columns to use: %s", new_columns)
 
-        # Convert the selected columns to numeric, coercing errors to NaN
-        df[new_columns] = df[new_columns].apply(pd.to_numeric, errors="coerce")
+        # Convert the selected columns to numeric, coercing errors to NaN; float columns
+        # are optionally narrowed to float32, halving their size for the aggregation
+        for column in new_columns:
+            values = _to_numeric(df[column])
+            if stat_vars_dtype == "float32" and values.dtype == np.float64:
+                values = values.astype(np.float32)
+            df[column] = values
         logging.info("Converted selected stat var columns to numeric.")
 
-        scol = []
-        for column, values in config.string_filters.items():
-            scol += [column]
+        scol = list(config.string_filters)
 
         columns = ['date'] + scol + new_columns
         logging.debug("Final DataFrame columns selected: %s", columns)
@@ -114,17 +434,18 @@ class ReadStat:
             self.save_dataframe(df, config.output_plot_file)
     
         if config.aggregate:
-            self.run_aggregation(df, add_columns)
+            # The stat var columns are the numeric ones; spare aggregation the dtype scan
+            self.run_aggregation(df, add_columns, numeric_columns=new_columns)
 
 
-    def run_aggregation(self, df, add_columns = None):
+    def run_aggregation(self, df, add_columns = None, numeric_columns = None):
             
             if not isinstance(df, pd.DataFrame):
                 df = pd.read_csv(df, sep="\t")
             
             logging.info("DataFrame shape after aggregation: %s", df.shape)
 
-            df = self.aggregation(df, self.config.group_by)
+            df = self.aggregation(df, self.config.group_by, numeric_columns)
 
             if add_columns is not None:
                 if self.config.line_type.lower() == "ecnt" and "ratio" in add_columns:
@@ -135,43 +456,133 @@ class ReadStat:
             self.save_dataframe(df, self.config.output_agg_file)
 
     def all_columns(self, line_type, line_type_columns=cn.LINE_TYPE_COLUMNS):
-        # Get the additional columns based on line type, or an empty list if not found
-        line_type_columns = line_type_columns.get(line_type.lower(), [])
-        full_cols = cn.FULL_HEADER + line_type_columns
+        # Get the additional columns based on line type, or an empty list if not found;
+        # the header tuples of the two built-in layouts are built once per line type
+        if line_type_columns is cn.LINE_TYPE_COLUMNS or line_type_columns is cn.LINE_TYPE_COLUMNS_OLD:
+            full_cols = list(_full_header(line_type.lower(), line_type_columns is cn.LINE_TYPE_COLUMNS_OLD))
+        else:
+            full_cols = cn.FULL_HEADER + line_type_columns.get(line_type.lower(), [])
         logging.debug("all_columns() for line_type '%s': %s", line_type, full_cols)
         return full_cols
 
     def process_file(self, file_path, line_type):
+        """
+        Reads a file, skips the first line, keeps the lines matching the
+        given line_type and parses them with the pandas C parser into a
+        Pandas DataFrame.
+
+        For the 'pct'/'pstd' line types the threshold columns are built
+        from the number of thresholds, which must then be the same on every
+        matching line. Falls back to line-by-line parsing (process_file_lines)
+        when it is not, or when the matching lines do not all have the
+        expected number of columns (e.g. the old MET column layout).
+        """
+        logging.info("Processing file: %s", file_path)
+        line_type_lower = line_type.lower()
+        headers = self.all_columns(line_type)
+        position = headers.index("line_type")
+
+        # Skip files that do not mention the line type at all without decoding them
+        if not _mentions_line_type(file_path, line_type_lower):
+            df = pd.DataFrame([], columns=headers)
+            logging.info("Processed file %s; resulting DataFrame shape: %s", file_path, df.shape)
+            return df
+
+        # Select the matching lines splitting each one only up to its line type
+        with open(file_path, "r") as file:
+            next(file)  # Skip the first line (header row)
+            lines = [line for line in file
+                     if line.split(None, position + 1)[position].lower() == line_type_lower]
+
+        if not lines:
+            df = pd.DataFrame([], columns=headers)
+            logging.info("Processed file %s; resulting DataFrame shape: %s", file_path, df.shape)
+            return df
+
+        if line_type_lower in ['pct', 'pstd']:
+            n_thresh_position = len(cn.FULL_HEADER) + 1
+            n_thresh = {line.split(None, n_thresh_position + 1)[n_thresh_position] for line in lines}
+            if len(n_thresh) == 1:
+                headers = self.update_headers(headers, lines[0].split(), line_type_lower)
+                logging.debug("Updated headers for %s: %s", line_type, headers)
+            else:
+                headers = None
+
+        if headers is not None:
+            # Parse them with one extra column so longer lines can be told apart; shorter
+            # lines are padded with '' (tokens are never empty, and 'NA' stays a string)
+            try:
+                df = pd.read_csv(io.StringIO("".join(lines)), sep=r"\s+", header=None, engine="c",
+                                 names=headers + ["__extra"], dtype=str, na_filter=False)
+            except pd.errors.ParserError:
+                df = None
+
+            if df is not None and (df[headers[-1]] != "").all() and (df["__extra"] == "").all():
+                df = df.drop(columns="__extra")
+                logging.info("Processed file %s; resulting DataFrame shape: %s", file_path, df.shape)
+                return df
+
+        logging.debug("Column count mismatch in %s; parsing it line by line.", file_path)
+        return self.process_file_lines(file_path, line_type)
+
+    def process_file_lines(self, file_path, line_type):
         """
         Reads a file line by line, skips the first line, 
         checks if a line matches the given line_type, 
         and adds it to a Pandas DataFrame.
+
+        Rows are kept as plain lists, grouped by the headers they were read
+        with; the groups are aligned on the final headers at the end.
         """
-        logging.info("Processing file: %s", file_path)
-        matching_rows = []
+        segments = []  # [headers, rows] for each run of lines read with the same headers
         # Get column headers dynamically
         headers = self.all_columns(line_type)
         fheaders = headers
+        n_fheaders = len(fheaders)
+
+        # Loop invariants: the line type position is the same in the old and new layouts
+        position = headers.index("line_type")
+        line_type_lower = line_type.lower()
+        dynamic_headers = line_type_lower in ['pct', 'pstd']
+        n_thresh_position = len(cn.FULL_HEADER) + 1
+        n_thresh = None
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
 
         with open(file_path, "r") as file:
             next(file)  # Skip the first line (header row)
             for line in file:
                 row_data = line.split()  # Split the line into columns
                 # Check if the line contains the specific line type
-                if row_data[headers.index("line_type")].lower() == line_type.lower():
-                    if line_type.lower() in ['pct', 'pstd']:
-                        fheaders = self.update_headers(headers, row_data, line_type.lower())
-                        logging.debug("Updated headers for %s: %s", line_type, fheaders)
-                    if len(row_data) != len(fheaders):
+                if row_data[position].lower() == line_type_lower:
+                    # The threshold headers only change with the number of thresholds
+                    if dynamic_headers and row_data[n_thresh_position] != n_thresh:
+                        fheaders = self.update_headers(headers, row_data, line_type_lower)
+                        n_fheaders = len(fheaders)
+                        n_thresh = row_data[n_thresh_position]
+                        if debug:
+                            logging.debug("Updated headers for %s: %s", line_type, fheaders)
+                    if len(row_data) != n_fheaders:
                         headers = self.all_columns(line_type, cn.LINE_TYPE_COLUMNS_OLD)
                         fheaders = headers
-                        logging.debug("Re-adjusted headers using old columns for file: %s", file_path)
-                    if len(row_data) == len(fheaders):
-                        row_dict = dict(zip(fheaders, row_data[:len(fheaders)]))
-                        matching_rows.append(row_dict)
+                        n_fheaders = len(fheaders)
+                        n_thresh = None
+                        if debug:
+                            logging.debug("Re-adjusted headers using old columns for file: %s", file_path)
+                    if len(row_data) == n_fheaders:
+                        if not segments or segments[-1][0] != fheaders:
+                            segments.append([fheaders, []])
+                        segments[-1][1].append(row_data)
                     else:
                         logging.warning("Skipping line in %s due to mismatched column count.", file_path)
-        df = pd.DataFrame(matching_rows, columns=fheaders)
+
+        if len(segments) == 1 and segments[0][0] == fheaders:
+            df = pd.DataFrame(segments[0][1], columns=fheaders)
+        elif segments:
+            # Columns missing from a group are NaN; columns not in the final headers are dropped
+            df = pd.concat([pd.DataFrame(rows, columns=headers) for headers, rows in segments],
+                           ignore_index=True).reindex(columns=fheaders)
+        else:
+            df = pd.DataFrame([], columns=fheaders)
         logging.info("Processed file %s; resulting DataFrame shape: %s", file_path, df.shape)
         return df
 
@@ -193,6 +604,9 @@ class ReadStat:
         """
         Filters the DataFrame based on a date range.
         Converts date strings to datetime format before filtering.
+        The %Y%m%d_%H%M%S strings sort like the dates they encode, so the
+        rows are pruned with string comparisons first and only the rows
+        in range are parsed.
         Raises an exception if the resulting DataFrame is empty.
         """
         logging.info("Filtering DataFrame by date range %s to %s on column '%s'.", start_date, end_date, date_column)
@@ -200,19 +614,28 @@ class ReadStat:
             if date_column not in df.columns:
                 raise KeyError(f"Column '{date_column}' not found in DataFrame. Cannot filter by date.")
     
-            df = df.copy()
-            df[date_column] = pd.to_datetime(df[date_column], format="%Y%m%d_%H%M%S", errors="coerce")
-            if df[date_column].isna().all():
-                logging.error("Date conversion failed; all values are NaT: %s", df[date_column])
-                raise ValueError(f"All values in column '{date_column}' could not be converted to datetime format.")
-    
             start_date = pd.to_datetime(start_date, format="%Y-%m-%d_%H:%M:%S")
             end_date = pd.to_datetime(end_date, format="%Y-%m-%d_%H:%M:%S")
-            df_filtered = df[(df[date_column] >= start_date) & (df[date_column] <= end_date)]
+
+            dates = df[date_column]
+            if pd.api.types.is_string_dtype(dates):
+                in_range = (dates >= start_date.strftime("%Y%m%d_%H%M%S")) & (dates <= end_date.strftime("%Y%m%d_%H%M%S"))
+                df = df[in_range]
+
+            # Parse into a local Series and attach it to the selected rows only (no copy of the input)
+            parsed_dates = pd.to_datetime(df[date_column], format="%Y%m%d_%H%M%S", errors="coerce")
+            in_range = (parsed_dates >= start_date) & (parsed_dates <= end_date)
+            df_filtered = df[in_range].assign(**{date_column: parsed_dates[in_range]})
     
             if df_filtered.empty:
+                # Tell a column that cannot be parsed apart from a range without data
+                parsed = pd.to_datetime(dates, format="%Y%m%d_%H%M%S", errors="coerce")
+                if parsed.isna().all():
+                    logging.error("Date conversion failed; all values are NaT: %s", parsed)
+                    raise ValueError(_DATE_PARSE_ERROR.format(date_column))
+
                 logging.error("Date filtering resulted in an empty DataFrame.")
-                raise ValueError("The DataFrame is empty after applying the date filter.")
+                raise ValueError(_EMPTY_AFTER_DATE)
     
             logging.info("Date filtering successful; resulting shape: %s", df_filtered.shape)
             return df_filtered
@@ -224,23 +647,31 @@ class ReadStat:
     def filter_by_threshold(self, df, thresholds):
         """
         Filters the DataFrame based on threshold values for multiple columns.
-        Converts numeric columns to float before filtering to prevent errors.
+        Converts numeric columns to float before filtering to prevent errors
+        (values that are not numbers, e.g. 'NA', fail the filter) and combines
+        all the ranges into a single mask, so the rows are selected once.
         Raises an exception if the resulting DataFrame is empty.
         """
         logging.info("Filtering DataFrame by thresholds: %s", thresholds)
         try:
-            df_filtered = df.copy()
-            for column, (min_val, max_val) in thresholds.items():
-                if column in df_filtered.columns:
-                    df_filtered.loc[:, column] = df_filtered[column].astype(float)
-                    df_filtered = df_filtered[(df_filtered[column] >= min_val) & (df_filtered[column] <= max_val)]
-                    logging.debug("After filtering column '%s', shape: %s", column, df_filtered.shape)
+            columns = []
+            for column in thresholds:
+                if column in df.columns:
+                    columns.append(column)
                 else:
                     logging.warning("Column '%s' not found in DataFrame, skipping threshold filter.", column)
+
+            values = df[columns].apply(_to_numeric).to_numpy(dtype=np.float64)
+            min_vals = np.array([thresholds[column][0] for column in columns], dtype=np.float64)
+            max_vals = np.array([thresholds[column][1] for column in columns], dtype=np.float64)
+            mask = ((values >= min_vals) & (values <= max_vals)).all(axis=1)
+
+            df_filtered = df[mask].assign(**{column: values[mask, j] for j, column in enumerate(columns)})
+            logging.debug("After filtering columns %s, shape: %s", columns, df_filtered.shape)
     
             if df_filtered.empty:
                 logging.error("Threshold filtering resulted in an empty DataFrame.")
-                raise ValueError("The DataFrame is empty after applying threshold filters.")
+                raise ValueError(_EMPTY_AFTER_THRESHOLD)
     
             logging.info("Threshold filtering successful; resulting shape: %s", df_filtered.shape)
             return df_filtered
@@ -252,21 +683,25 @@ class ReadStat:
     def filter_by_string(self, df, string_filters):
         """
         Filters the DataFrame based on allowed string values for multiple columns.
+        The per-column matches are combined into a single mask, so the rows are
+        selected once.
         Raises an exception if the resulting DataFrame is empty.
         """
         logging.info("Filtering DataFrame using string filters: %s", string_filters)
         try:
-            df_filtered = df.copy()
+            mask = np.ones(len(df), dtype=bool)
             for column, allowed_values in string_filters.items():
-                if column in df_filtered.columns:
-                    df_filtered = df_filtered[df_filtered[column].isin(allowed_values)]
-                    logging.debug("After filtering column '%s', shape: %s", column, df_filtered.shape)
+                if column in df.columns:
+                    mask &= df[column].isin(allowed_values).to_numpy()
+                    logging.debug("After filtering column '%s', %d rows remain.", column, np.count_nonzero(mask))
                 else:
                     logging.warning("Column '%s' not found in DataFrame, skipping string filter.", column)
+
+            df_filtered = df[mask]
     
             if df_filtered.empty:
                 logging.error("String filtering resulted in an empty DataFrame.")
-                raise ValueError("The DataFrame is empty after applying the string filter.")
+                raise ValueError(_EMPTY_AFTER_STRING)
     
             logging.info("String filtering successful; resulting shape: %s", df_filtered.shape)
             return df_filtered
@@ -303,7 +738,8 @@ class ReadStat:
             logging.exception("Error in filter_by_columns:")
             raise RuntimeError(f"Error in `filter_by_columns`: {str(e)}")
 
-    def aggregation(self, df: pd.DataFrame, group_by_columns: list[str]) -> pd.DataFrame:
+    def aggregation(self, df: pd.DataFrame, group_by_columns: list[str],
+                    numeric_columns: list[str] | None = None) -> pd.DataFrame:
         """
         Aggregates the given DataFrame by the specified group_by_columns while keeping 
         the 'date' column if all values in the group are the same, and adds a 'total' 
@@ -312,6 +748,8 @@ class ReadStat:
         Parameters:
           - df (pd.DataFrame): Input DataFrame containing the data.
           - group_by_columns (list[str]): List of column names to group by.
+          - numeric_columns (list[str], optional): Columns to average, when already
+                          known; by default every numeric column of df.
     
         Returns:
           - pd.DataFrame: Aggregated DataFrame, with one row per group, numeric columns
@@ -319,17 +757,25 @@ class ReadStat:
         """
         logging.info("Aggregating DataFrame using group_by columns: %s", group_by_columns)
     
-        # 1) Mean‑aggregate all numeric columns
-        agg_funcs  = {col: "mean" for col in df.select_dtypes(include="number").columns}
-        grouped    = df.groupby(group_by_columns, as_index=False)
-        aggregated = grouped.agg(agg_funcs)
+        # 1) Mean‑aggregate all numeric columns with the built-in groupby reduction (numeric
+        #    group keys are averaged in place too), after the non-numeric group keys
+        if numeric_columns is None:
+            numeric_columns = list(df.select_dtypes(include="number").columns)
+        grouped    = df.groupby(group_by_columns, observed=True)
+        means      = grouped[numeric_columns].mean()
+        keys       = means.index.to_frame(index=False)
+        keys       = keys[[col for col in keys.columns if col not in numeric_columns]]
+        means      = means.reset_index(drop=True)
     
-        # 2) Compute the group sizes via size().reset_index(), then rename the last column to 'total'
-        counts = df.groupby(group_by_columns).size().reset_index()
-        counts.columns = list(group_by_columns) + ["total"]
+        # 2) Add the group sizes from the same grouping (same group order) as 'total';
+        #    a 'total' column already in the data becomes 'total_x' and the sizes 'total_y'
+        total_name = "total"
+        if "total" in means.columns:
+            means = means.rename(columns={"total": "total_x"})
+            total_name = "total_y"
+        sizes = pd.Series(grouped.size().to_numpy(), name=total_name)
     
-        # 3) Merge the counts back into the aggregated DataFrame
-        result = pd.merge(aggregated, counts, on=group_by_columns, how="left")
+        result = pd.concat([keys, means, sizes], axis=1)
     
         logging.info("Aggregation complete; resulting shape: %s", result.shape)
         return result
@@ -344,7 +790,7 @@ class ReadStat:
                 logging.error("Attempted to save an empty DataFrame.")
                 raise ValueError("Cannot save an empty DataFrame.")
     
-            df.to_csv(output_file, sep="\t", index=False, header=True)
+            _write_tsv(df, output_file)
             logging.info("DataFrame saved successfully to %s.", output_file)
     
         except Exception as e:
@@ -1,5 +1,318 @@
 import numpy as np
-from scipy.signal import convolve2d
+from scipy.ndimage import uniform_filter
+from scipy.special import expit, softmax
+from vcast._jit import njit, HAS_NUMBA
+
+@njit(cache=True, nogil=True)
+def _summed_area_table_numba(binary, sat):
+    """
+    Compiled version of _summed_area_table: fill the zeroed `sat` with the
+    summed-area table of `binary`.
+    """
+    n, m = binary.shape
+    for i in range(n):
+        row = 0
+        for j in range(m):
+            row += binary[i, j]
+            sat[i + 1, j + 1] = sat[i, j + 1] + row
+    return sat
+
+@njit(cache=True, nogil=True)
+def _box_sums_numba(sat, before, after, counts):
+    """
+    Compiled version of _box_sums: read each clipped window sum into `counts`
+    with four lookups.
+    """
+    n, m = counts.shape
+    for i in range(n):
+        i0 = max(i - before, 0)
+        i1 = min(i + after + 1, n)
+        for j in range(m):
+            j0 = max(j - before, 0)
+            j1 = min(j + after + 1, m)
+            counts[i, j] = sat[i1, j1] - sat[i0, j1] - sat[i1, j0] + sat[i0, j0]
+    return counts
+
+@njit(cache=True, nogil=True)
+def _contingency_counts_numba(fcst_mask, ref_mask):
+    """
+    Compiled version of _contingency_counts: one pass over both masks.
+    """
+    fcst_mask = fcst_mask.ravel()
+    ref_mask = ref_mask.ravel()
+    hits = 0
+    n_fcst = 0
+    n_ref = 0
+    for k in range(fcst_mask.size):
+        f = fcst_mask[k]
+        r = ref_mask[k]
+        hits += f & r
+        n_fcst += f
+        n_ref += r
+    return hits, n_fcst, n_ref
+
+@njit(fastmath={"reassoc", "contract"}, cache=True, nogil=True)
+def _difference_sums_numba(fcst, ref, masked, threshold):
+    """
+    Compiled one-pass reduction of fcst - ref without forming the difference
+    field: the number of points and the sums of the differences, of their
+    absolute values and of their squares. With `masked`, only the points where
+    fcst >= threshold are reduced (no compacted copies of the fields). Each
+    block of points is summed on its own before being added to the float64
+    totals, which keeps the rounding error close to NumPy's pairwise summation.
+    """
+    fcst = fcst.ravel()
+    ref = ref.ravel()
+    n = fcst.size
+    count = 0
+    total = 0.0
+    total_abs = 0.0
+    total_sq = 0.0
+    for start in range(0, n, 4096):
+        block = 0.0
+        block_abs = 0.0
+        block_sq = 0.0
+        stop = min(start + 4096, n)
+        if masked:
+            for k in range(start, stop):
+                if fcst[k] >= threshold:
+                    d = fcst[k] - ref[k]
+                    block += d
+                    block_abs += abs(d)
+                    block_sq += d * d
+                    count += 1
+        else:
+            for k in range(start, stop):
+                d = fcst[k] - ref[k]
+                block += d
+                block_abs += abs(d)
+                block_sq += d * d
+            count += stop - start
+        total += block
+        total_abs += block_abs
+        total_sq += block_sq
+    return count, total, total_abs, total_sq
+
+@njit(fastmath={"reassoc", "contract"}, cache=True, nogil=True)
+def _correlation_sums_numba(fcst, ref):
+    """
+    Compiled two-pass reduction for the Pearson correlation: the float64 means
+    of both fields, then the sums of the cross and squared anomaly products,
+    without the centered copies. Summed block by block like
+    _difference_sums_numba.
+    """
+    fcst = fcst.ravel()
+    ref = ref.ravel()
+    n = fcst.size
+    sum_f = 0.0
+    sum_r = 0.0
+    for start in range(0, n, 4096):
+        block_f = 0.0
+        block_r = 0.0
+        for k in range(start, min(start + 4096, n)):
+            block_f += fcst[k]
+            block_r += ref[k]
+        sum_f += block_f
+        sum_r += block_r
+    mean_f = sum_f / n
+    mean_r = sum_r / n
+
+    cross = 0.0
+    ss_f = 0.0
+    ss_r = 0.0
+    for start in range(0, n, 4096):
+        block_cross = 0.0
+        block_f = 0.0
+        block_r = 0.0
+        for k in range(start, min(start + 4096, n)):
+            a = fcst[k] - mean_f
+            b = ref[k] - mean_r
+            block_cross += a * b
+            block_f += a * a
+            block_r += b * b
+        cross += block_cross
+        ss_f += block_f
+        ss_r += block_r
+    return cross, ss_f, ss_r
+
+def _difference_means(forecast_values, reference_values, threshold=None):
+    """
+    Means of forecast - reference, of its absolute value and of its square,
+    in one pass over the fields with the compiled kernel. With a threshold,
+    only the points where the forecast is >= threshold are used, as in
+    apply_threshold_mask.
+
+    Returns:
+    tuple or None: (bias, mae, mse) in the dtype of the differences (NaN when
+        no point passes the threshold), or None when Numba is unavailable or
+        the fields are empty, of different shapes or not floating point
+        (callers then use NumPy).
+    """
+    dtype = np.result_type(forecast_values, reference_values)
+    if (not HAS_NUMBA or dtype.kind != "f" or forecast_values.size == 0
+            or forecast_values.shape != reference_values.shape):
+        return None
+    masked = threshold is not None
+    count, *sums = _difference_sums_numba(np.ascontiguousarray(forecast_values),
+                                          np.ascontiguousarray(reference_values),
+                                          masked, float(threshold) if masked else 0.0)
+    if count == 0:
+        return (np.nan,) * 3
+    return tuple(dtype.type(total / count) for total in sums)
+
+def _contingency_counts(fcst_mask, ref_mask):
+    """
+    Contingency table of two event masks of the same shape.
+
+    The masks are read as uint8 and only the hits and the forecast and reference
+    event totals are counted; the other entries follow from them.
+
+    Returns:
+    tuple: (hits, misses, false_alarms, correct_rejections)
+    """
+    fcst_mask = np.ascontiguousarray(fcst_mask).view(np.uint8)
+    ref_mask = np.ascontiguousarray(ref_mask).view(np.uint8)
+    if HAS_NUMBA:
+        hits, n_fcst, n_ref = _contingency_counts_numba(fcst_mask, ref_mask)
+    else:
+        hits = np.count_nonzero(fcst_mask & ref_mask)
+        n_fcst = np.count_nonzero(fcst_mask)
+        n_ref = np.count_nonzero(ref_mask)
+
+    misses = n_ref - hits
+    false_alarms = n_fcst - hits
+    correct_rejections = fcst_mask.size - hits - misses - false_alarms
+    return hits, misses, false_alarms, correct_rejections
+
+def _summed_area_table(binary):
+    """
+    Summed-area table of a binary field, zero-padded by one row and column, so
+    that the events of any window can be read with four lookups (_box_sums).
+
+    Parameters:
+    binary (np.ndarray): Boolean event field of shape (n, m), or unsigned integer
+        per-point event counts (e.g. ensemble members exceeding a threshold).
+
+    Returns:
+    np.ndarray: Table of shape (n + 1, m + 1); int32 when the grid total cannot
+        overflow it (halving the table traffic), int64 otherwise.
+    """
+    binary = np.ascontiguousarray(binary)
+    if binary.dtype == np.bool_:
+        binary = binary.view(np.uint8)
+
+    n, m = binary.shape
+    max_value = np.iinfo(binary.dtype).max if binary.dtype.kind in "iu" else 1
+    sat_dtype = np.int32 if binary.size * int(max_value) < 2**31 else np.int64
+    sat = np.zeros((n + 1, m + 1), dtype=sat_dtype)
+
+    if HAS_NUMBA:
+        return _summed_area_table_numba(binary, sat)
+
+    np.cumsum(np.cumsum(binary, axis=0, dtype=sat_dtype), axis=1, out=sat[1:, 1:])
+    return sat
+
+def _box_sums(sat, before, after):
+    """
+    Read the event count of the window [i - before, i + after] x
+    [j - before, j + after] around every grid point, clipped at the grid edges,
+    from a table built by _summed_area_table. Uses the compiled kernel when
+    Numba is available.
+
+    Returns:
+    np.ndarray: Event counts of shape (n, m), in the dtype of the table.
+    """
+    n, m = sat.shape[0] - 1, sat.shape[1] - 1
+
+    if HAS_NUMBA:
+        counts = np.empty((n, m), dtype=sat.dtype)
+        return _box_sums_numba(sat, before, after, counts)
+
+    i0 = np.clip(np.arange(n) - before, 0, n)
+    i1 = np.clip(np.arange(n) + after + 1, 0, n)
+    j0 = np.clip(np.arange(m) - before, 0, m)
+    j1 = np.clip(np.arange(m) + after + 1, 0, m)
+    return sat[np.ix_(i1, j1)] - sat[np.ix_(i0, j1)] - sat[np.ix_(i1, j0)] + sat[np.ix_(i0, j0)]
+
+def _window_counts(binary, before, after):
+    """
+    Count the events of a binary field in the window [i - before, i + after] x
+    [j - before, j + after] around every grid point, clipped at the grid edges.
+
+    Every window is read from a summed-area table in O(1), so the cost does not
+    depend on the window size.
+
+    Parameters:
+    binary (np.ndarray): Boolean event field of shape (n, m), or unsigned integer
+        per-point event counts (e.g. ensemble members exceeding a threshold).
+    before (int): Window extent before each point, along both axes.
+    after (int): Window extent after each point, along both axes.
+
+    Returns:
+    np.ndarray: Event counts of shape (n, m); int32 when the grid total cannot
+        overflow it, int64 otherwise.
+    """
+    return _box_sums(_summed_area_table(binary), before, after)
+
+@njit(cache=True, nogil=True)
+def _fraction_sums_numba(fcst_counts, ref_counts, fcst_scale, ref_scale):
+    """
+    Compiled version of _fraction_sums: one pass over both count fields,
+    summed block by block like _difference_sums_numba.
+    """
+    fcst_counts = fcst_counts.ravel()
+    ref_counts = ref_counts.ravel()
+    n = fcst_counts.size
+    sq_diff = 0.0
+    sq_sum = 0.0
+    for start in range(0, n, 4096):
+        block_diff = 0.0
+        block_sum = 0.0
+        for k in range(start, min(start + 4096, n)):
+            f = fcst_counts[k] * fcst_scale
+            r = ref_counts[k] * ref_scale
+            block_diff += (f - r) * (f - r)
+            block_sum += f * f + r * r
+        sq_diff += block_diff
+        sq_sum += block_sum
+    return sq_diff, sq_sum
+
+def _fraction_sums(fcst_counts, ref_counts, fcst_scale, ref_scale):
+    """
+    Turn neighborhood event counts into fractions and return the sums of
+    (f - r)**2 and of f**2 + r**2 over the grid, without the per-term grid-sized
+    temporaries of computing the three means separately.
+
+    Parameters:
+        fcst_counts (ndarray): Forecast neighborhood counts, shape (H, W).
+        ref_counts (ndarray): Reference neighborhood counts, shape (H, W).
+        fcst_scale (float): Factor converting forecast counts to fractions.
+        ref_scale (float): Factor converting reference counts to fractions.
+
+    Returns:
+        tuple: (sum of squared differences, sum of squared fractions)
+    """
+    if HAS_NUMBA:
+        return _fraction_sums_numba(fcst_counts, ref_counts, fcst_scale, ref_scale)
+
+    f = (fcst_counts * fcst_scale).ravel()
+    r = (ref_counts * ref_scale).ravel()
+    sq_sum = np.dot(f, f) + np.dot(r, r)
+    f -= r
+    return np.dot(f, f), sq_sum
+
+def _as_matching_arrays(forecast_values, reference_values):
+    """
+    Return both inputs as NumPy arrays (arrays are passed through without a copy).
+
+    Raises:
+        ValueError: If the shapes of the inputs do not match.
+    """
+    forecast_values = np.asarray(forecast_values)
+    reference_values = np.asarray(reference_values)
+    if forecast_values.shape != reference_values.shape:
+        raise ValueError("Forecast values and reference values must have the same shape.")
+    return forecast_values, reference_values
 
 def apply_threshold_mask(forecast_values, reference_values, threshold=None):
     """
@@ -31,6 +344,27 @@ def apply_threshold_mask(forecast_values, reference_values, threshold=None):
 
     return forecast_values, reference_values
 
+def _threshold_mask(forecast_values, reference_values, threshold=None):
+    """
+    Mask form of apply_threshold_mask for reductions with `where=`: the boolean
+    mask of the points where the forecast is >= threshold (True when there is
+    no threshold), instead of compacted copies of both fields.
+
+    Returns:
+        np.ndarray, bool or None: The mask, or None if no valid data points exist.
+
+    Raises:
+        ValueError: If the shapes of the inputs do not match.
+    """
+    if forecast_values.shape != reference_values.shape:
+        raise ValueError("Forecast values and reference values must have the same shape.")
+
+    if threshold is None:
+        return True
+
+    mask = forecast_values >= threshold
+    return mask if np.any(mask) else None
+
 def compute_mse(forecast_values, reference_values, threshold=None):
     """
     Compute the Mean Squared Error (MSE) between forecast values and reference values.
@@ -47,14 +381,22 @@ def compute_mse(forecast_values, reference_values, threshold=None):
     Returns:
         float or np.nan: The MSE value, or np.nan if no valid data points exist.
     """
-    forecast_values, reference_values = apply_threshold_mask(forecast_values, reference_values, threshold)
+    # Reduce the points passing the threshold in place when possible
+    means = _difference_means(forecast_values, reference_values, threshold)
+    if means is not None:
+        return means[2]
+
+    mask = _threshold_mask(forecast_values, reference_values, threshold)
 
-    if forecast_values is None or reference_values is None:
+    if mask is None:
         return np.nan  # Return np.nan if no valid data points remain
 
-    # Compute MSE
+    # Compute MSE over the masked points (no gathered copies of the fields), accumulating
+    # in float64 like the compiled reduction and returning the dtype of the differences
     differences = forecast_values - reference_values
-    mse = np.mean(np.square(differences))
+    mse = np.mean(np.square(differences), where=mask, dtype=np.float64)
+    if differences.dtype.kind == "f":
+        mse = differences.dtype.type(mse)
 
     return mse
 
@@ -74,7 +416,9 @@ def compute_rmse(forecast_values, reference_values, threshold=None):
     Returns:
         float or np.nan: The RMSE value, or np.nan if no valid data points exist.
     """
-    mse = compute_mse(forecast_values, reference_values, threshold)
+    # Take the MSE straight from the fused reduction when possible
+    means = _difference_means(forecast_values, reference_values, threshold)
+    mse = means[2] if means is not None else compute_mse(forecast_values, reference_values, threshold)
 
     return np.sqrt(mse) if not np.isnan(mse) else np.nan
 
@@ -95,29 +439,37 @@ def compute_bias(forecast_values, reference_values, threshold=None):
     Returns:
         float or np.nan: The bias value (mean difference), or np.nan if no valid data points exist.
     """
-    forecast_values, reference_values = apply_threshold_mask(forecast_values, reference_values, threshold)
+    # Reduce the points passing the threshold in place when possible
+    means = _difference_means(forecast_values, reference_values, threshold)
+    if means is not None:
+        return means[0]
 
-    if forecast_values is None or reference_values is None:
+    mask = _threshold_mask(forecast_values, reference_values, threshold)
+
+    if mask is None:
         return np.nan  # Return np.nan if no valid data points remain
 
-    # Compute bias as the mean of the differences (forecast - reference)
+    # Compute bias as the mean of the differences (forecast - reference) over the masked points,
+    # accumulating in float64 like the compiled reduction
     differences = forecast_values - reference_values
-    bias = np.mean(differences)
+    bias = np.mean(differences, where=mask, dtype=np.float64)
+    if differences.dtype.kind == "f":
+        bias = differences.dtype.type(bias)
 
     return bias
 
 
 def compute_quantiles(forecast_values, reference_values):
     """
-    Calculate key quantiles, interquartile range (IQR), and identify outliers in the data.
+    Calculate key quantiles, interquartile range (IQR), and whisker limits of the data.
 
     Parameters:
     forecast_values (np.ndarray): Forecasted values of shape (n, m).
     reference_values (np.ndarray): Reference values of shape (n, m).
 
     Returns:
-    dict: A dictionary containing Q1 (25th percentile), Q2 (median), Q3 (75th percentile),
-          IQR, lower and upper whisker limits, and outliers.
+    list: Q1 (25th percentile), Q2 (median), Q3 (75th percentile), IQR, and the lower
+          and upper whisker limits.
     """
     # Check if the shapes match
     if forecast_values.shape != reference_values.shape:
@@ -126,12 +478,11 @@ def compute_quantiles(forecast_values, reference_values):
     data = forecast_values - reference_values
 
     # Flatten data in case it's a 2D array
-    data = np.ma.masked_invalid(data).compressed()  # Mask NaNs and infinities, then flatten
+    data = data[np.isfinite(data)]  # Drop NaNs and infinities, then flatten
 
-    # Calculate quantiles
-    Q1 = np.percentile(data, 25)  # 25th percentile
-    Q2 = np.percentile(data, 50)  # Median (50th percentile)
-    Q3 = np.percentile(data, 75)  # 75th percentile
+    # Calculate the quantiles with a single selection pass over the data (the
+    # differences are a temporary, so they may be partitioned in place)
+    Q1, Q2, Q3 = np.percentile(data, np.array([25, 50, 75], dtype=data.dtype), overwrite_input=True)
 
     # Calculate IQR
     IQR = Q3 - Q1
@@ -140,9 +491,6 @@ def compute_quantiles(forecast_values, reference_values):
     lower_whisker = Q1 - 1.5 * IQR
     upper_whisker = Q3 + 1.5 * IQR
 
-    # Identify outliers
-    outliers = data[(data < lower_whisker) | (data > upper_whisker)]
-
     # Results in a dictionary
     # quantile_results = {
     #     "Q1 (25th Percentile)": Q1,
@@ -150,8 +498,7 @@ def compute_quantiles(forecast_values, reference_values):
     #     "Q3 (75th Percentile)": Q3,
     #     "IQR": IQR,
     #     "Lower Whisker": lower_whisker,
-    #     "Upper Whisker": upper_whisker,
-    #     "Outliers": outliers
+    #     "Upper Whisker": upper_whisker
     # }
 
     quantile_results = [Q1,Q2,Q3,IQR,lower_whisker,upper_whisker]
@@ -172,15 +519,57 @@ def compute_mae(forecast_values, reference_values):
     Raises:
     - ValueError: If shapes do not match.
     """
-    forecast_values = np.asarray(forecast_values)
-    reference_values = np.asarray(reference_values)
+    forecast_values, reference_values = _as_matching_arrays(forecast_values, reference_values)
 
-    if forecast_values.shape != reference_values.shape:
-        raise ValueError("Forecast values and reference values must have the same shape.")
+    means = _difference_means(forecast_values, reference_values)
+    if means is not None:
+        return means[1]
 
     return np.mean(np.abs(forecast_values - reference_values))
 
 
+def compute_bulk(forecast_values, reference_values, metrics):
+    """
+    Compute several difference-based metrics from a single forecast-minus-reference field.
+
+    compute_bias, compute_rmse and compute_mae each subtract the two fields again; this
+    subtracts them once and reduces the same differences, giving identical results.
+    With Numba the three means come from a single fused pass over the two fields.
+
+    Parameters:
+    - forecast_values (np.ndarray): Forecasted values.
+    - reference_values (np.ndarray): Reference values.
+    - metrics (iterable): Any of "bias", "rmse", "mae", "mse".
+
+    Returns:
+    - dict: The requested metrics by name.
+
+    Raises:
+    - ValueError: If shapes do not match.
+    """
+    forecast_values, reference_values = _as_matching_arrays(forecast_values, reference_values)
+
+    metrics = set(metrics)
+    results = {}
+
+    means = _difference_means(forecast_values, reference_values)
+    if means is None:
+        differences = forecast_values - reference_values
+        means = (np.mean(differences) if "bias" in metrics else None,
+                 np.mean(np.abs(differences)) if "mae" in metrics else None,
+                 np.mean(np.square(differences)) if metrics & {"mse", "rmse"} else None)
+    bias, mae, mse = means
+
+    if "bias" in metrics:
+        results["bias"] = bias
+    if "mae" in metrics:
+        results["mae"] = mae
+    if metrics & {"mse", "rmse"}:
+        results["mse"] = mse
+        results["rmse"] = np.sqrt(mse) if not np.isnan(mse) else np.nan
+
+    return results
+
 def compute_scores(fcst_data, ref_data, fcst_threshold, ref_threshold, radius = None):
     """
     Calculate hits, misses, false alarms, and correct rejections based on forecast and reference data.
@@ -207,44 +596,14 @@ def compute_scores(fcst_data, ref_data, fcst_threshold, ref_threshold, radius =
     fcst_mask = fcst_data >= fcst_threshold
     ref_mask = ref_data >= ref_threshold
 
-    if radius == 0:
-        # Local grid point calculation
-        hits = np.sum(fcst_mask & ref_mask)                   # Both forecast and reference detect an event
-        misses = np.sum(~fcst_mask & ref_mask)                # Reference detects an event, forecast does not
-        false_alarms = np.sum(fcst_mask & ~ref_mask)          # Forecast detects an event, reference does not
-        correct_rejections = np.sum(~fcst_mask & ~ref_mask)   # Neither detect an event
-    else:
-        # Radius of influence calculation
-        n, m = fcst_data.shape
-        hits = 0
-        misses = 0
-        false_alarms = 0
-        correct_rejections = 0
-
-        # Iterate through each grid point
-        for i in range(n):
-            for j in range(m):
-                # Define the neighborhood bounds (clipping at grid edges)
-                i_min = max(0, i - radius)
-                i_max = min(n, i + radius + 1)
-                j_min = max(0, j - radius)
-                j_max = min(m, j + radius + 1)
-
-                # Extract the neighborhood masks
-                fcst_neighborhood = fcst_mask[i_min:i_max, j_min:j_max]
-                ref_neighborhood = ref_mask[i_min:i_max, j_min:j_max]
-
-                # Check for hits, misses, false alarms, or correct rejections
-                if ref_mask[i, j]:  # Reference event exists at this point
-                    if np.any(fcst_neighborhood):  # Any forecast in the neighborhood
-                        hits += 1
-                    else:
-                        misses += 1
-                else:  # No reference event at this point
-                    if np.any(fcst_neighborhood):  # Forecast in the neighborhood but no reference
-                        false_alarms += 1
-                    else:
-                        correct_rejections += 1
+    if radius != 0:
+        # Radius of influence calculation: a forecast event counts anywhere within
+        # `radius` grid points of each point (clipped at the grid edges)
+        fcst_mask = _window_counts(fcst_mask, radius, radius) > 0
+
+    # hits: both detect an event; misses: only the reference does;
+    # false_alarms: only the forecast does; correct_rejections: neither does
+    hits, misses, false_alarms, correct_rejections = _contingency_counts(fcst_mask, ref_mask)
 
     # Total events
     total_events = hits + misses + false_alarms + correct_rejections
@@ -357,8 +716,12 @@ def compute_success_ratio(hits, false_alarms):
     Returns:
     - float: Success Ratio (SR).
     """
-    # Compute Success Ratio
-    sr = 1 - compute_far(hits, false_alarms)
+    # Compute Success Ratio as 1 - FAR
+    forecasted_events = hits + false_alarms
+    if forecasted_events == 0:
+        return np.nan
+
+    sr = 1 - false_alarms / forecasted_events
 
     return sr
 
@@ -399,20 +762,33 @@ def compute_correlation(forecast_values, reference_values):
     Raises:
     ValueError: If the shapes of the inputs do not match.
     """
-    # Ensure the inputs are numpy arrays
-    forecast_values = np.asarray(forecast_values)
-    reference_values = np.asarray(reference_values)
-
-    # Check if the shapes match
-    if forecast_values.shape != reference_values.shape:
-        raise ValueError("Forecast values and reference values must have the same shape.")
+    # Ensure the inputs are numpy arrays of the same shape
+    forecast_values, reference_values = _as_matching_arrays(forecast_values, reference_values)
 
     # Flatten the arrays in case they are 2D
     forecast_values = forecast_values.ravel()
     reference_values = reference_values.ravel()
 
-    # Compute and return the Pearson correlation coefficient
-    return np.corrcoef(forecast_values, reference_values)[0, 1]
+    if HAS_NUMBA and forecast_values.size > 0:
+        # Two streaming passes (means, then anomaly products) in float64 with no temporaries
+        cross, forecast_ss, reference_ss = _correlation_sums_numba(
+            np.ascontiguousarray(forecast_values), np.ascontiguousarray(reference_values))
+    else:
+        # Center both fields once (in float64, like np.corrcoef) and reduce the cross and squared
+        # products with einsum, avoiding the stacked copy and 2x2 covariance matrix of np.corrcoef
+        forecast_values = forecast_values.astype(np.float64, copy=False)
+        reference_values = reference_values.astype(np.float64, copy=False)
+        forecast_anomalies = forecast_values - forecast_values.mean()
+        reference_anomalies = reference_values - reference_values.mean()
+        cross = np.einsum('i,i->', forecast_anomalies, reference_anomalies, optimize=True)
+        forecast_ss = np.einsum('i,i->', forecast_anomalies, forecast_anomalies, optimize=True)
+        reference_ss = np.einsum('i,i->', reference_anomalies, reference_anomalies, optimize=True)
+
+    # Same normalization and clipping as np.corrcoef
+    ddof = forecast_values.size - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cross / ddof / np.sqrt(forecast_ss / ddof) / np.sqrt(reference_ss / ddof)
+    return np.clip(corr, -1, 1)
 
 def compute_stdev(forecast_values, reference_values):
     """
@@ -428,13 +804,8 @@ def compute_stdev(forecast_values, reference_values):
     Raises:
     ValueError: If the shapes of the inputs do not match.
     """
-    # Ensure the inputs are numpy arrays
-    forecast_values = np.asarray(forecast_values)
-    reference_values = np.asarray(reference_values)
-
-    # Check if the shapes match
-    if forecast_values.shape != reference_values.shape:
-        raise ValueError("Forecast values and reference values must have the same shape.")
+    # Ensure the inputs are numpy arrays of the same shape
+    forecast_values, reference_values = _as_matching_arrays(forecast_values, reference_values)
 
     # Compute and return the standard deviation of forecast values
     return np.std(forecast_values)
@@ -455,42 +826,77 @@ def compute_fss(forecast_values, reference_values, fcst_threshold, ref_threshold
     Raises:
     ValueError: If the shapes of the inputs do not match or the window size is invalid.
     """
-    if forecast_values.shape != reference_values.shape:
-        raise ValueError("Forecast values and reference values must have the same shape.")
-    if window_size <= 0:
-        raise ValueError("Window size must be greater than zero.")
+    return compute_fss_windows(forecast_values, reference_values, fcst_threshold, ref_threshold,
+                               [window_size])[0]
 
-    # Convert both forecast and reference fields to binary events (1 if >= threshold, else 0)
-    fcst_binary = (forecast_values >= fcst_threshold).astype(float)
-    ref_binary = (reference_values >= ref_threshold).astype(float)
-
-    # If neither field contains events, FSS cannot be computed
-    if not (np.any(fcst_binary) or np.any(ref_binary)):
-        return np.nan
+def compute_fss_windows(forecast_values, reference_values, fcst_threshold, ref_threshold, window_sizes):
+    """
+    Compute the Fractions Skill Score (FSS) of the same thresholds for several window sizes.
 
-    # Define the kernel for neighborhood averaging
-    kernel = np.ones((window_size, window_size), dtype=float)
+    The event fields and their summed-area tables are built once and every window size
+    only reads its window counts from them, so a sweep over window sizes costs little
+    more than a single compute_fss call. Each value equals compute_fss for that size.
 
-    # Compute the fraction of event occurrence in the neighborhood using 2D convolution
-    fcst_fractions = convolve2d(fcst_binary, kernel, mode='same', boundary='fill', fillvalue=0)
-    ref_fractions = convolve2d(ref_binary, kernel, mode='same', boundary='fill', fillvalue=0)
+    Parameters:
+    forecast_values (np.ndarray): Forecasted values of shape (n, m).
+    reference_values (np.ndarray): Observed values of shape (n, m).
+    fcst_threshold (float): The forecast threshold above which an event is defined.
+    ref_threshold (float): The reference threshold above which an event is defined.
+    window_sizes (iterable of int): Sizes of the windows for fraction computation.
 
-    # Normalize the fractions by the area of the kernel
-    kernel_area = window_size ** 2
-    fcst_fractions /= kernel_area
-    ref_fractions /= kernel_area
+    Returns:
+    list: The FSS value of each window size, in order.
 
-    # Calculate the mean square error (MSE) between the forecast and reference fractions
-    mse_fractions = np.mean((fcst_fractions - ref_fractions) ** 2)
+    Raises:
+    ValueError: If the shapes of the inputs do not match or a window size is invalid.
+    """
+    window_sizes = list(window_sizes)
+    if forecast_values.shape != reference_values.shape:
+        raise ValueError("Forecast values and reference values must have the same shape.")
+    if any(window_size <= 0 for window_size in window_sizes):
+        raise ValueError("Window size must be greater than zero.")
 
-    # Compute the reference MSE (the worst-case scenario)
-    ref_mse = np.mean(fcst_fractions**2) + np.mean(ref_fractions**2)
-    if ref_mse == 0:
-        return np.nan
+    # Convert both forecast and reference fields to binary events (True if >= threshold)
+    fcst_binary = forecast_values >= fcst_threshold
+    ref_binary = reference_values >= ref_threshold
 
-    # Compute FSS: 1 indicates perfect skill, 0 indicates no skill
-    fss = 1 - mse_fractions / ref_mse
-    return fss
+    # If neither field contains events, FSS cannot be computed
+    fcst_any = np.any(fcst_binary)
+    ref_any = np.any(ref_binary)
+    if not (fcst_any or ref_any):
+        return [np.nan] * len(window_sizes)
+
+    # With events in only one field the fractions MSE equals the reference MSE
+    # exactly, so the score is 0 (no skill) without computing any window counts
+    if not (fcst_any and ref_any):
+        return [0.0] * len(window_sizes)
+
+    # Build the summed-area tables of both event fields once for all the window sizes
+    fcst_sat = _summed_area_table(fcst_binary)
+    ref_sat = _summed_area_table(ref_binary)
+
+    scores = []
+    for window_size in window_sizes:
+        # Count the events in the window_size x window_size neighborhood of each point,
+        # aligned as a centered 'same' convolution with zero fill
+        before, after = window_size // 2, (window_size - 1) // 2
+        fcst_counts = _box_sums(fcst_sat, before, after)
+        ref_counts = _box_sums(ref_sat, before, after)
+
+        # Normalize the counts by the area of the kernel to get the event fractions, and compute
+        # the mean square error (MSE) between the forecast and reference fractions together
+        # with the reference MSE (the worst-case scenario) in a single pass
+        kernel_area = window_size ** 2
+        sq_diff, sq_sum = _fraction_sums(fcst_counts, ref_counts, 1.0 / kernel_area, 1.0 / kernel_area)
+        mse_fractions = sq_diff / fcst_counts.size
+        ref_mse = sq_sum / fcst_counts.size
+        if ref_mse == 0:
+            scores.append(np.nan)
+            continue
+
+        # Compute FSS: 1 indicates perfect skill, 0 indicates no skill
+        scores.append(1 - mse_fractions / ref_mse)
+    return scores
 
 def compute_brier_score(forecast_values, reference_values, threshold, window_size, probability_type='binary'):
     """
@@ -522,8 +928,8 @@ def compute_brier_score(forecast_values, reference_values, threshold, window_siz
     if forecast_values.shape != reference_values.shape:
         raise ValueError("Forecast values and reference outcomes must have the same shape.")
     
-    # Apply thresholding to create a binary reference outcome (0 or 1)
-    reference_outcomes = (reference_values >= threshold).astype(int)
+    # Apply thresholding to create a binary reference outcome (kept boolean; no int copy)
+    reference_outcomes = reference_values >= threshold
     
     # Compute forecast probabilities based on the specified type
     if probability_type == 'raw':
@@ -535,28 +941,39 @@ def compute_brier_score(forecast_values, reference_values, threshold, window_siz
         forecast_probabilities = (forecast_values - min_val) / (max_val - min_val)
 
     elif probability_type == 'binary':
-        # Convert forecast values to binary (0 or 1) based on the threshold
-        forecast_probabilities = (forecast_values >= threshold).astype(int)
+        # Convert forecast values to binary (False/True read as 0/1) based on the threshold
+        forecast_probabilities = forecast_values >= threshold
 
     elif probability_type == 'sigmoid':
         # Apply a sigmoid function to convert forecast values to probabilities
-        forecast_probabilities = 1 / (1 + np.exp(-forecast_values))
+        # (single-pass and overflow-safe for large negative values)
+        forecast_probabilities = expit(forecast_values)
 
     elif probability_type == 'softmax':
-        # Apply softmax normalization
-        exp_values = np.exp(forecast_values - np.max(forecast_values))
-        forecast_probabilities = exp_values / np.sum(exp_values)
+        # Apply softmax normalization over the whole field
+        forecast_probabilities = softmax(forecast_values, axis=None)
 
     else:
         raise ValueError("Invalid probability_type. Choose from 'raw', 'binary', 'sigmoid', 'softmax'.")
     
-    # Apply spatial pooling using convolution (if window_size > 1)
+    # Apply spatial pooling with a window_size x window_size box mean (if window_size > 1),
+    # aligned as a centered 'same' convolution with zero fill. Binary fields are pooled
+    # exactly from window event counts; others with a separable running-sum box filter
     if window_size > 1:
-        kernel = np.ones((window_size, window_size)) / (window_size ** 2)
-        forecast_probabilities = convolve2d(forecast_probabilities, kernel, mode='same', boundary='fill', fillvalue=0)
-        reference_outcomes = convolve2d(reference_outcomes, kernel, mode='same', boundary='fill', fillvalue=0)
+        before, after = window_size // 2, (window_size - 1) // 2
+        kernel_area = window_size ** 2
+        if probability_type == 'binary':
+            forecast_probabilities = _window_counts(forecast_probabilities, before, after) / kernel_area
+        else:
+            forecast_probabilities = uniform_filter(np.asarray(forecast_probabilities, dtype=np.float64),
+                                                    size=window_size, mode='constant', cval=0.0)
+        reference_outcomes = _window_counts(reference_outcomes, before, after) / kernel_area
+    elif probability_type == 'binary':
+        # Two binary fields: the squared error is 1 exactly where they disagree
+        return np.mean(forecast_probabilities != reference_outcomes)
 
-    # Calculate the Brier Score
-    brier_score = np.mean((forecast_probabilities - reference_outcomes) ** 2)
+    # Calculate the Brier Score (in float64, whatever the precision of the forecast)
+    differences = np.subtract(forecast_probabilities, reference_outcomes, dtype=np.float64)
+    brier_score = np.mean(np.square(differences, out=differences))
 
     return brier_score